@@ -13,4 +13,7 @@ if not OPENAI_KEY:
 if not APIFY_KEY:
     print("WARNING: APIFY_KEY not found in environment variables")
 
-model = "gpt-4o-mini"
\ No newline at end of file
+model = "gpt-4o-mini"
+
+# Model used for short hooks; override to a smaller/faster variant via HOOK_MODEL
+hook_model = os.getenv('HOOK_MODEL', model)
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Combined hook + script generation module.
+Produces both a hook and a remixed script for a post in a single GPT call.
+"""
+
+import asyncio
+import logging
+from typing import Dict, Any
+
+import orjson
+
+from admin import model
+
+from . import hook, script
+from .support.errors import CompletionError
+from .support.gpt import DEFAULT_MAX_TOKENS, achat_completion
+
+# Logging is configured by the application entry point
+logger = logging.getLogger(__name__)
+
+COMBINED_SYSTEM_MESSAGE = """You write two things for the same social media post: a hook and a rewritten script.
+Follow the HOOK TASK instructions for the hook and the SCRIPT TASK instructions for the script.
+Respond with a JSON object with exactly two string fields: "hook" and "script"."""
+
+async def process_separately(post_data: Dict[str, Any], remix_instruction: str) -> Dict[str, str]:
+    """Fallback: generate the hook and script with two concurrent calls"""
+    hook_result, script_result = await asyncio.gather(
+        hook.process_content(post_data, remix_instruction),
+        script.process_content(post_data, remix_instruction),
+    )
+    return {"hook": hook_result, "remixed_content": script_result}
+
+async def process_content(post_data: Dict[str, Any], remix_instruction: str) -> Dict[str, str]:
+    """
+    Main function to generate a hook and a script in one call.
+
+    Args:
+        post_data: The complete post data
+        remix_instruction: User's specific instruction for remixing
+
+    Returns:
+        dict: {"hook": ..., "remixed_content": ...}
+    """
+    post_number = post_data.get('post_number', 'unknown')
+    try:
+        logger.info(f"Generating hook and script for post {post_number}")
+
+        # One call can't use two models: with a separate HOOK_MODEL the hook
+        # comes from its own call so it matches what remix_type='hook' returns
+        if hook.hook_model != model:
+            return await process_separately(post_data, remix_instruction)
+
+        script_prompt = await script.build_prompt(post_data)
+        if not script_prompt:
+            # Unsupported content or missing transcript: let each module produce its own fallback
+            return await process_separately(post_data, remix_instruction)
+
+        hook_rules, hook_prompt = hook.build_prompt(post_data)
+        prompt = f"""HOOK TASK:
+{hook_rules}
+
+{hook_prompt}
+
+SCRIPT TASK:
+{script_prompt}"""
+
+        platform = post_data.get('platform', '').lower()
+        max_tokens = DEFAULT_MAX_TOKENS + hook.PLATFORM_MAX_TOKENS.get(platform, hook.GENERIC_MAX_TOKENS)
+
+        result = await achat_completion(
+            prompt,
+            system_message=COMBINED_SYSTEM_MESSAGE,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            # Sampled with the hook's settings so the hook matches remix_type='hook';
+            # the script in this call is therefore generated at HOOK_TEMPERATURE too
+            model_name=hook.hook_model,
+            temperature=hook.HOOK_TEMPERATURE,
+        )
+
+        try:
+            parsed = orjson.loads(result)
+            return {"hook": str(parsed["hook"]).strip(), "remixed_content": str(parsed["script"]).strip()}
+        except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.error(f"Invalid combined response for post {post_number}: {str(e)}")
+            return await process_separately(post_data, remix_instruction)
+
+    except CompletionError:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating hook and script: {str(e)}")
+        return {
+            "hook": f"Error generating hook: {str(e)}",
+            "remixed_content": f"Error processing content as script: {str(e)}"
+        }
@@ -4,28 +4,23 @@ Creates catchy hooks for social media content based on platform and content type
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Tuple
+
+from admin import hook_model
+
+from .support.errors import CompletionError
+from .support.gpt import achat_completion, achat_completion_stream
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def generate_twitter_hook(post_data: Dict[str, Any]) -> str:
-    """Generate a hook for Twitter content"""
-    logger.info(f"Generating Twitter hook for post: {post_data.get('post_number', 'unknown')}")
-    
-    # For Twitter threads, use combined text; for single tweets, use text
-    if post_data.get('content_type') == 'thread':
-        content_text = post_data.get('combined_text', '')
-    else:
-        content_text = post_data.get('text', '')
-    
-    prompt = f"""You are a professional hook writer who makes catchy hooks for Twitter content.
+# Static per-platform instructions sent as the system message. Keeping them
+# byte-identical across calls, with the post content last in the user message,
+# gives OpenAI's prefix-based prompt cache a stable prefix to match.
+TWITTER_HOOK_RULES = """You are a professional hook writer who makes catchy hooks for Twitter content.
 Based on this data, what would be a good hook that grabs attention and encourages engagement?
 
-Content data:
-{content_text}
-
 Rules:
 - Keep it short and impactful (under 280 characters)
 - Use curiosity or emotion to draw readers in
@@ -35,27 +30,9 @@ Rules:
 - Dont make a hook that's too long
 - Dont add a hook that's too wordy"""
 
-    # Import and use GPT function
-    try:
-        from support.gpt import chat_completion
-        result = chat_completion(prompt)
-        return result
-    except Exception as e:
-        logger.error(f"Error generating Twitter hook: {str(e)}")
-        return f"[TWITTER HOOK] Error generating hook for post {post_data.get('post_number', 'unknown')}"
-
-def generate_instagram_hook(post_data: Dict[str, Any]) -> str:
-    """Generate a hook for Instagram content"""
-    logger.info(f"Generating Instagram hook for post: {post_data.get('post_number', 'unknown')}")
-    
-    content_text = post_data.get('text', '')
-    
-    prompt = f"""You are a professional hook writer who makes catchy hooks for Instagram content.
+INSTAGRAM_HOOK_RULES = """You are a professional hook writer who makes catchy hooks for Instagram content.
 Based on this data, what would be a good hook that grabs attention and encourages engagement?
 
-Content data:
-{content_text}
-
 Rules:
 - Keep it engaging and conversational
 - Use curiosity or emotion to draw readers in
@@ -66,27 +43,9 @@ Rules:
 - Dont make a hook that's too long
 - Dont add a hook that's too wordy"""
 
-    # Import and use GPT function
-    try:
-        from support.gpt import chat_completion
-        result = chat_completion(prompt)
-        return result
-    except Exception as e:
-        logger.error(f"Error generating Instagram hook: {str(e)}")
-        return f"[INSTAGRAM HOOK] Error generating hook for post {post_data.get('post_number', 'unknown')}"
-
-def generate_linkedin_hook(post_data: Dict[str, Any]) -> str:
-    """Generate a hook for LinkedIn content"""
-    logger.info(f"Generating LinkedIn hook for post: {post_data.get('post_number', 'unknown')}")
-    
-    content_text = post_data.get('text', '')
-    
-    prompt = f"""You are a professional hook writer who makes catchy hooks for LinkedIn content.
+LINKEDIN_HOOK_RULES = """You are a professional hook writer who makes catchy hooks for LinkedIn content.
 Based on this data, what would be a good hook that grabs attention and encourages professional engagement?
 
-Content data:
-{content_text}
-
 Rules:
 - Keep it professional but engaging
 - Use curiosity or value proposition to draw readers in
@@ -97,29 +56,9 @@ Rules:
 - Dont make a hook that's too long
 - Dont add a hook that's too wordy"""
 
-    # Import and use GPT function
-    try:
-        from support.gpt import chat_completion
-        result = chat_completion(prompt)
-        return result
-    except Exception as e:
-        logger.error(f"Error generating LinkedIn hook: {str(e)}")
-        return f"[LINKEDIN HOOK] Error generating hook for post {post_data.get('post_number', 'unknown')}"
-
-def generate_youtube_hook(post_data: Dict[str, Any]) -> str:
-    """Generate a hook for YouTube content"""
-    logger.info(f"Generating YouTube hook for post: {post_data.get('post_number', 'unknown')}")
-    
-    content_text = post_data.get('text', '')  # Video title
-    description = post_data.get('description', '')
-    combined_text = f"{content_text}\n\n{description}" if description else content_text
-    
-    prompt = f"""You are a professional hook writer who makes catchy hooks for YouTube content.
+YOUTUBE_HOOK_RULES = """You are a professional hook writer who makes catchy hooks for YouTube content.
 Based on this data, what would be a good hook that grabs attention and encourages clicks?
 
-Content data:
-{combined_text}
-
 Rules:
 - Keep it engaging and curiosity-driven
 - Make it relevant to the video content
@@ -129,27 +68,9 @@ Rules:
 - Dont make a hook that's too long
 - Dont add a hook that's too wordy"""
 
-    # Import and use GPT function
-    try:
-        from support.gpt import chat_completion
-        result = chat_completion(prompt)
-        return result
-    except Exception as e:
-        logger.error(f"Error generating YouTube hook: {str(e)}")
-        return f"[YOUTUBE HOOK] Error generating hook for post {post_data.get('post_number', 'unknown')}"
-
-def generate_tiktok_hook(post_data: Dict[str, Any]) -> str:
-    """Generate a hook for TikTok content"""
-    logger.info(f"Generating TikTok hook for post: {post_data.get('post_number', 'unknown')}")
-    
-    content_text = post_data.get('text', '')
-    
-    prompt = f"""You are a professional hook writer who makes catchy hooks for TikTok content.
+TIKTOK_HOOK_RULES = """You are a professional hook writer who makes catchy hooks for TikTok content.
 Based on this data, what would be a good hook that grabs attention and encourages engagement?
 
-Content data:
-{content_text}
-
 Rules:
 - Keep it short, snappy, and attention-grabbing
 - Use trending language or slang if appropriate
@@ -160,16 +81,97 @@ Rules:
 - Dont make a hook that's too long
 - Dont add a hook that's too wordy"""
 
-    # Import and use GPT function
-    try:
-        from support.gpt import chat_completion
-        result = chat_completion(prompt)
-        return result
-    except Exception as e:
-        logger.error(f"Error generating TikTok hook: {str(e)}")
-        return f"[TIKTOK HOOK] Error generating hook for post {post_data.get('post_number', 'unknown')}"
+# User message templates; only the post content varies per call
+HOOK_USER_TEMPLATE = """Content data:
+{content}"""
+
+GENERIC_HOOK_USER_TEMPLATE = """Platform: {platform}
+
+Content data:
+{content}"""
+
+GENERIC_HOOK_RULES = """You are a professional hook writer who makes catchy hooks for social media content.
+Based on this data from the given platform, what would be a good hook?
+
+Rules:
+- Keep it engaging and attention-grabbing
+- Make it relevant to the content
+- Don't add emojis unless they're in the original
+- Don't add hashtags unless they're in the original
+- Dont make a hook that's too long
+- Dont add a hook that's too wordy"""
+
+# Platform -> hook rules used as the system message
+PLATFORM_PROMPTS: Dict[str, str] = {
+    "twitter": TWITTER_HOOK_RULES,
+    "instagram": INSTAGRAM_HOOK_RULES,
+    "linkedin": LINKEDIN_HOOK_RULES,
+    "youtube": YOUTUBE_HOOK_RULES,
+    "tiktok": TIKTOK_HOOK_RULES,
+}
+
+# Platform -> generation budget. Hooks are a sentence or two, and OpenAI
+# latency scales with generated tokens, so cap well below the script default.
+PLATFORM_MAX_TOKENS: Dict[str, int] = {
+    "twitter": 80,
+    "tiktok": 100,
+    "instagram": 180,
+    "youtube": 180,
+    "linkedin": 220,
+}
+GENERIC_MAX_TOKENS = 180
+
+# Hooks follow hard constraints (length, no added emojis/hashtags), so sample
+# deterministically; identical posts then produce identical, cacheable hooks
+HOOK_TEMPERATURE = 0.0
+
+def _extract_text(post_data: Dict[str, Any], platform: str) -> str:
+    """Pick the text a hook should be based on for the given platform"""
+    # For Twitter threads, use combined text; for single tweets, use text
+    if platform == 'twitter' and post_data.get('content_type') == 'thread':
+        return post_data.get('combined_text', '')
+    
+    content_text = post_data.get('text', '')
+    
+    # YouTube text is the video title; include the description when present
+    if platform == 'youtube':
+        description = post_data.get('description', '')
+        return f"{content_text}\n\n{description}" if description else content_text
+    
+    return content_text
+
+def _generation_options(platform: str) -> Dict[str, Any]:
+    """GPT generation settings for hooks on the given platform"""
+    return {
+        "max_tokens": PLATFORM_MAX_TOKENS.get(platform, GENERIC_MAX_TOKENS),
+        "model_name": hook_model,
+        "temperature": HOOK_TEMPERATURE,
+    }
+
+def build_prompt(post_data: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Build the hook system rules and user prompt for a post without calling GPT.
+    
+    Args:
+        post_data: The complete post data
+        
+    Returns:
+        tuple: (system rules, user prompt)
+    """
+    platform = post_data.get('platform', '').lower()
+    
+    rules = PLATFORM_PROMPTS.get(platform)
+    content_text = _extract_text(post_data, platform)
+    if rules:
+        prompt = HOOK_USER_TEMPLATE.format(content=content_text)
+    else:
+        # Default fallback
+        logger.warning(f"Unknown platform: {platform}")
+        rules = GENERIC_HOOK_RULES
+        prompt = GENERIC_HOOK_USER_TEMPLATE.format(platform=platform, content=content_text)
+    return rules, prompt
 
-def process_content(post_data: Dict[str, Any], remix_instruction: str) -> str:
+async def process_content(post_data: Dict[str, Any], remix_instruction: str) -> str:
     """
     Main function to generate hooks based on content type.
     
@@ -180,48 +182,43 @@ def process_content(post_data: Dict[str, Any], remix_instruction: str) -> str:
     Returns:
         str: The generated hook
     """
+    post_number = post_data.get('post_number', 'unknown')
     try:
-        logger.info(f"Generating hook for post {post_data.get('post_number', 'unknown')}")
-        
         # Extract platform
         platform = post_data.get('platform', '').lower()
+        logger.info(f"Generating {platform} hook for post: {post_number}")
         
-        # Determine which function to call based on platform
-        if platform == 'twitter':
-            return generate_twitter_hook(post_data)
-        elif platform == 'instagram':
-            return generate_instagram_hook(post_data)
-        elif platform == 'linkedin':
-            return generate_linkedin_hook(post_data)
-        elif platform == 'youtube':
-            return generate_youtube_hook(post_data)
-        elif platform == 'tiktok':
-            return generate_tiktok_hook(post_data)
-        else:
-            # Default fallback
-            logger.warning(f"Unknown platform: {platform}")
-            prompt = f"""You are a professional hook writer who makes catchy hooks for social media content.
-Based on this data from {platform}, what would be a good hook?
-
-Content data:
-{post_data.get('text', '')}
-
-Rules:
-- Keep it engaging and attention-grabbing
-- Make it relevant to the content
-- Don't add emojis unless they're in the original
-- Don't add hashtags unless they're in the original
-- Dont make a hook that's too long
-- Dont add a hook that's too wordy"""
-            
-            try:
-                from support.gpt import chat_completion
-                result = chat_completion(prompt)
-                return result
-            except Exception as e:
-                logger.error(f"Error generating generic hook: {str(e)}")
-                return f"[GENERIC HOOK] Error generating hook for post {post_data.get('post_number', 'unknown')}"
+        rules, prompt = build_prompt(post_data)
+        
+        try:
+            return await achat_completion(prompt, system_message=rules, **_generation_options(platform))
+        except CompletionError:
+            raise
+        except Exception as e:
+            label = platform.upper() if platform in PLATFORM_PROMPTS else "GENERIC"
+            logger.error(f"Error generating {platform} hook: {str(e)}")
+            return f"[{label} HOOK] Error generating hook for post {post_number}"
             
+    except CompletionError:
+        raise
     except Exception as e:
         logger.error(f"Error generating hook: {str(e)}")
-        return f"Error generating hook: {str(e)}"
\ No newline at end of file
+        return f"Error generating hook: {str(e)}"
+
+async def stream_content(post_data: Dict[str, Any], remix_instruction: str) -> AsyncIterator[str]:
+    """
+    Stream a generated hook as it is produced.
+    
+    Args:
+        post_data: The complete post data
+        remix_instruction: User's specific instruction for remixing (not used for hooks)
+        
+    Yields:
+        str: Successive fragments of the generated hook
+    """
+    platform = post_data.get('platform', '').lower()
+    logger.info(f"Streaming {platform} hook for post: {post_data.get('post_number', 'unknown')}")
+    
+    rules, prompt = build_prompt(post_data)
+    async for fragment in achat_completion_stream(prompt, system_message=rules, **_generation_options(platform)):
+        yield fragment
@@ -1,72 +1,181 @@
 from fastapi import FastAPI, Request
-from typing import Dict, Any
-import json
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, Any, AsyncIterator, List
+import asyncio
 import logging
-import sys
-import os
 
-# Add the current directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import orjson
+
+from .support.errors import CompletionError
+from .support.transcript import aprefetch_transcripts
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+@app.exception_handler(CompletionError)
+async def completion_error_handler(request: Request, exc: CompletionError):
+    """GPT failed after retries: report an upstream error instead of placeholder content"""
+    logger.error(f"GPT completion failed: {exc}")
+    return ORJSONResponse(
+        status_code=502,
+        content={
+            "status": "error",
+            "message": "Content generation failed upstream",
+            "error": str(exc)
+        }
+    )
 
 # Import the script and hook modules
 try:
-    import script
+    from . import script
     logger.info("Successfully imported script module")
 except ImportError as e:
     logger.error(f"Failed to import script module: {e}")
     script = None
 
 try:
-    import hook
+    from . import hook
     logger.info("Successfully imported hook module")
 except ImportError as e:
     logger.error(f"Failed to import hook module: {e}")
     hook = None
 
+try:
+    from . import combined
+    logger.info("Successfully imported combined module")
+except ImportError as e:
+    logger.error(f"Failed to import combined module: {e}")
+    combined = None
+
+# Upper bound on concurrent remix jobs from a single batch request,
+# kept below OpenAI rate limits
+BATCH_CONCURRENCY = 50
+batch_semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+async def dispatch(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Route a single post to the script, hook or combined processor based on remix_type"""
+    remix_type = data.get('remix_type', 'unknown')
+    if remix_type == 'both' and combined:
+        # Hook and script from a single GPT call
+        logger.debug("Calling combined.process_content function")
+        result = await combined.process_content(data, "Sample instruction")
+        logger.debug("Combined processing result: %s", result)
+        return result
+    elif remix_type == 'script' and script:
+        logger.debug("Calling script.process_content function")
+        result_content = await script.process_content(data, "Sample instruction")
+        logger.debug("Script processing result: %s", result_content)
+    elif remix_type == 'hook' and hook:
+        logger.debug("Calling hook.process_content function")
+        result_content = await hook.process_content(data, "Sample instruction")
+        logger.debug("Hook processing result: %s", result_content)
+    else:
+        logger.debug("No processing function called for remix_type: %s", remix_type)
+        result_content = "No processing performed"
+    return {"remixed_content": result_content}
+
 @app.post("/remix")
 async def remix_content(request: Request):
     # Receive raw JSON data
-    data = await request.json()
+    data = orjson.loads(await request.body())
     
-    print("Received remix request:")
-    print(f"Remix type: {data.get('remix_type', 'unknown')}")
-    print(f"Platform: {data.get('platform', 'unknown')}")
-    print(f"Content type: {data.get('content_type', 'unknown')}")
-    print(f"Post number: {data.get('post_number', 'unknown')}")
+    logger.debug(
+        "Received remix: type=%s platform=%s content_type=%s post=%s",
+        data.get('remix_type'), data.get('platform'), data.get('content_type'), data.get('post_number')
+    )
     
     # Process based on remix_type
     remix_type = data.get('remix_type', 'unknown')
-    result_content = ""
-    if remix_type == 'script' and script:
-        print("Calling script.process_content function")
-        result_content = script.process_content(data, "Sample instruction")
-        print(f"Script processing result: {result_content}")
-    elif remix_type == 'hook' and hook:
-        print("Calling hook.process_content function")
-        result_content = hook.process_content(data, "Sample instruction")
-        print(f"Hook processing result: {result_content}")
-    else:
-        print(f"No processing function called for remix_type: {remix_type}")
-        result_content = "No processing performed"
+    result = await dispatch(data)
     
     return {
         "status": "success",
         "message": "Data received and processed",
         "remix_type": remix_type,
         "post_number": data.get('post_number', 'unknown'),
-        "remixed_content": result_content
+        **result
     }
 
+@app.post("/remix/batch")
+async def remix_batch(request: Request):
+    """Remix many posts in one request, fanning them out concurrently"""
+    data = orjson.loads(await request.body())
+    items: List[Dict[str, Any]] = data.get('items', [])
+    
+    logger.debug("Received batch remix request with %d items", len(items))
+    
+    # Fetch the batch's Instagram/TikTok transcripts in shared actor runs up front;
+    # each script remix below then reads its transcript from the cache
+    await aprefetch_transcripts([item for item in items if item.get('remix_type') in ('script', 'both')])
+    
+    async def bounded_dispatch(item: Dict[str, Any]) -> Dict[str, Any]:
+        async with batch_semaphore:
+            return await dispatch(item)
+    
+    # Same idea as a batched prompt: one round-trip for the caller, N parallel LLM calls
+    results = await asyncio.gather(*(bounded_dispatch(item) for item in items), return_exceptions=True)
+    
+    response_items = []
+    for item, result in zip(items, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error processing batch item {item.get('post_number', 'unknown')}: {result}")
+            response_items.append({
+                "status": "error",
+                "remix_type": item.get('remix_type', 'unknown'),
+                "post_number": item.get('post_number', 'unknown'),
+                "error": str(result)
+            })
+        else:
+            response_items.append({
+                "status": "success",
+                "remix_type": item.get('remix_type', 'unknown'),
+                "post_number": item.get('post_number', 'unknown'),
+                **result
+            })
+    
+    return {
+        "status": "success",
+        "message": f"Processed {len(items)} items",
+        "results": response_items
+    }
+
+@app.post("/remix/stream")
+async def remix_stream(request: Request):
+    """Stream the remixed hook or script as plain text while it is generated"""
+    data = orjson.loads(await request.body())
+    remix_type = data.get('remix_type', 'unknown')
+    
+    logger.debug("Received streaming remix: type=%s post=%s", remix_type, data.get('post_number'))
+    
+    if remix_type == 'script' and script:
+        generator = script.stream_content(data, "Sample instruction")
+    elif remix_type == 'hook' and hook:
+        generator = hook.stream_content(data, "Sample instruction")
+    else:
+        async def no_processing():
+            yield "No processing performed"
+        generator = no_processing()
+    
+    # Start generating before answering: a GPT failure ahead of the first
+    # fragment raises CompletionError here and becomes a 502, not a 200 stream
+    first = await anext(generator, None)
+    
+    async def resume() -> AsyncIterator[str]:
+        if first is not None:
+            yield first
+        async for fragment in generator:
+            yield fragment
+    
+    return StreamingResponse(resume(), media_type="text/plain")
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+# Run from the repository root: python -m remix.main
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
@@ -4,29 +4,18 @@ Identifies content type and calls appropriate processing function.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Optional
+
+from .support.errors import CompletionError
+from .support.gpt import achat_completion, achat_completion_stream
+from .support.transcript import aget_video_transcript
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def process_twitter_thread(post_data: Dict[str, Any]) -> str:
-    """Process Twitter thread content"""
-    logger.info(f"Processing Twitter thread: {post_data.get('post_number', 'unknown')}")
-    
-    # Extract all tweet texts to create a combined thread
-    tweets = post_data.get('tweets', [])
-    thread_texts = []
-    
-    for tweet in tweets:
-        tweet_number = tweet.get('tweet_number', 'unknown')
-        tweet_text = tweet.get('text', '')
-        thread_texts.append(f"Tweet {tweet_number}: {tweet_text}")
-    
-    combined_thread = "\n\n".join(thread_texts)
-    
-    # Create GPT prompt for thread processing
-    prompt = f"""You are an expert copywriter creating a Twitter thread. 
+# Prompt templates, parsed once at import and filled per post with str.format
+THREAD_SCRIPT_TEMPLATE = """You are an expert copywriter creating a Twitter thread. 
 I'll give you an original thread as inspiration. Please rewrite it for me using:
 - Simple, human language for a wide audience
 - Copy the general language style of the original thread
@@ -38,27 +27,11 @@ I'll give you an original thread as inspiration. Please rewrite it for me using:
 - Dont add emojis or other non-text elements
 
 Original thread:
-{combined_thread}
+{thread}
 
 Please create a new version based on this content, formatted as a proper Twitter thread with numbered tweets."""
 
-    # Import and use GPT function
-    try:
-        from support.gpt import chat_completion
-        result = chat_completion(prompt)
-        return result
-    except Exception as e:
-        logger.error(f"Error using GPT: {str(e)}")
-        return f"[TWITTER THREAD SCRIPT] Processing thread {post_data.get('post_number', 'unknown')}"
-
-def process_text_post(post_data: Dict[str, Any]) -> str:
-    """Process text-based posts (Twitter tweets, LinkedIn posts)"""
-    platform = post_data.get('platform', 'unknown')
-    logger.info(f"Processing {platform} text post: {post_data.get('post_number', 'unknown')}")
-    
-    # Create GPT prompt for text post processing
-    original_text = post_data.get('text', '')
-    prompt = f"""You are an expert copywriter creating content for {platform}. 
+TEXT_POST_SCRIPT_TEMPLATE = """You are an expert copywriter creating content for {platform}. 
 I'll give you a post as inspiration. Please rewrite it for me using:
 - Simple, human language for a wide audience
 - Copy the general language style of the original text
@@ -68,57 +41,120 @@ I'll give you a post as inspiration. Please rewrite it for me using:
 - Dont add emojis or other non-text elements
 
 Original post:
-{original_text}
+{text}
+
+Please create a new version based on this content with improved formatting."""
+
+VIDEO_SCRIPT_TEMPLATE = """You are an expert copywriter creating content for {platform}. 
+I'll give you a video transcript as inspiration. Please rewrite it for me using:
+- Simple, human language for a wide audience
+- Copy the general language style of the original content
+- Keep it engaging and natural
+- Format the content well with proper spacing
+- Maintain the core message and tone
+- Dont add emojis or other non-text elements
+
+Video transcript:
+{transcript}
 
 Please create a new version based on this content with improved formatting."""
 
-    # Import and use GPT function
+def build_thread_prompt(post_data: Dict[str, Any]) -> str:
+    """Build the rewrite prompt for a Twitter thread"""
+    # Extract all tweet texts to create a combined thread
+    tweets = post_data.get('tweets', [])
+    thread_texts = []
+    
+    for tweet in tweets:
+        tweet_number = tweet.get('tweet_number', 'unknown')
+        tweet_text = tweet.get('text', '')
+        thread_texts.append(f"Tweet {tweet_number}: {tweet_text}")
+    
+    combined_thread = "\n\n".join(thread_texts)
+    
+    # Create GPT prompt for thread processing
+    prompt = THREAD_SCRIPT_TEMPLATE.format(thread=combined_thread)
+    return prompt
+
+async def process_twitter_thread(post_data: Dict[str, Any]) -> str:
+    """Process Twitter thread content"""
+    logger.info(f"Processing Twitter thread: {post_data.get('post_number', 'unknown')}")
+    
+    prompt = build_thread_prompt(post_data)
+
+    # Use GPT function
     try:
-        from support.gpt import chat_completion
-        result = chat_completion(prompt)
+        result = await achat_completion(prompt)
         return result
+    except CompletionError:
+        raise
+    except Exception as e:
+        logger.error(f"Error using GPT: {str(e)}")
+        return f"[TWITTER THREAD SCRIPT] Processing thread {post_data.get('post_number', 'unknown')}"
+
+def build_text_prompt(post_data: Dict[str, Any]) -> str:
+    """Build the rewrite prompt for a text-based post"""
+    platform = post_data.get('platform', 'unknown')
+    
+    # Create GPT prompt for text post processing
+    original_text = post_data.get('text', '')
+    prompt = TEXT_POST_SCRIPT_TEMPLATE.format(platform=platform, text=original_text)
+    return prompt
+
+async def process_text_post(post_data: Dict[str, Any]) -> str:
+    """Process text-based posts (Twitter tweets, LinkedIn posts)"""
+    platform = post_data.get('platform', 'unknown')
+    logger.info(f"Processing {platform} text post: {post_data.get('post_number', 'unknown')}")
+    
+    prompt = build_text_prompt(post_data)
+
+    # Use GPT function
+    try:
+        result = await achat_completion(prompt)
+        return result
+    except CompletionError:
+        raise
     except Exception as e:
         logger.error(f"Error using GPT: {str(e)}")
         return f"[{platform.upper()} TEXT POST SCRIPT] Processing post {post_data.get('post_number', 'unknown')}"
 
-def process_video_post(post_data: Dict[str, Any]) -> str:
+async def fetch_transcript(post_data: Dict[str, Any]) -> Optional[str]:
+    """Fetch the transcript for a video post"""
+    platform = post_data.get('platform', 'unknown')
+    
+    # Get video URL (different platforms may have different fields)
+    video_url = post_data.get('video_url') or post_data.get('url')
+    logger.info(f"Video URL for transcript: {video_url}")
+    
+    # Get transcript (cached per video in the transcript module)
+    transcript = await aget_video_transcript(platform, post_data, video_url)
+    logger.info(f"Transcript result: {transcript}")
+    return transcript
+
+def build_video_prompt(platform: str, transcript: str) -> str:
+    """Build the rewrite prompt for a video transcript"""
+    prompt = VIDEO_SCRIPT_TEMPLATE.format(platform=platform, transcript=transcript)
+    return prompt
+
+async def process_video_post(post_data: Dict[str, Any]) -> str:
     """Process video-based posts (Instagram, YouTube, TikTok)"""
     platform = post_data.get('platform', 'unknown')
     logger.info(f"Processing {platform} video post: {post_data.get('post_number', 'unknown')}")
     
     # For video posts, we need to get the transcript first
     try:
-        from support.transcript import get_video_transcript
-        
-        # Get video URL (different platforms may have different fields)
-        video_url = post_data.get('video_url') or post_data.get('url')
-        logger.info(f"Video URL for transcript: {video_url}")
-        
-        # Get transcript
-        transcript = get_video_transcript(platform, post_data, video_url)
-        logger.info(f"Transcript result: {transcript}")
+        transcript = await fetch_transcript(post_data)
         
         if transcript:
             # Create GPT prompt for video transcript processing
-            prompt = f"""You are an expert copywriter creating content for {platform}. 
-I'll give you a video transcript as inspiration. Please rewrite it for me using:
-- Simple, human language for a wide audience
-- Copy the general language style of the original content
-- Keep it engaging and natural
-- Format the content well with proper spacing
-- Maintain the core message and tone
-- Dont add emojis or other non-text elements
-
-Video transcript:
-{transcript}
-
-Please create a new version based on this content with improved formatting."""
+            prompt = build_video_prompt(platform, transcript)
             
-            # Import and use GPT function
+            # Use GPT function
             try:
-                from support.gpt import chat_completion
-                result = chat_completion(prompt)
+                result = await achat_completion(prompt)
                 return result
+            except CompletionError:
+                raise
             except Exception as e:
                 logger.error(f"Error using GPT: {str(e)}")
                 return f"[{platform.upper()} VIDEO POST SCRIPT] Processing post {post_data.get('post_number', 'unknown')} with transcript"
@@ -126,11 +162,35 @@ Please create a new version based on this content with improved formatting."""
             # Fallback if no transcript available
             return f"[{platform.upper()} VIDEO POST SCRIPT] Processing post {post_data.get('post_number', 'unknown')} - Transcript not available"
             
+    except CompletionError:
+        raise
     except Exception as e:
         logger.error(f"Error processing video post: {str(e)}")
         return f"[{platform.upper()} VIDEO POST SCRIPT] Error processing post {post_data.get('post_number', 'unknown')}"
 
-def process_content(post_data: Dict[str, Any], remix_instruction: str) -> str:
+async def build_prompt(post_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Build the script rewrite prompt for a post without calling GPT.
+    
+    Args:
+        post_data: The complete post data
+        
+    Returns:
+        str: The prompt, or None if the content type is unsupported or no transcript is available
+    """
+    platform = post_data.get('platform', '').lower()
+    content_type = post_data.get('content_type', '').lower()
+    
+    if platform == 'twitter' and content_type == 'thread':
+        return build_thread_prompt(post_data)
+    elif platform in ['twitter', 'linkedin']:
+        return build_text_prompt(post_data)
+    elif platform in ['youtube', 'instagram', 'tiktok']:
+        transcript = await fetch_transcript(post_data)
+        return build_video_prompt(post_data.get('platform', 'unknown'), transcript) if transcript else None
+    return None
+
+async def process_content(post_data: Dict[str, Any], remix_instruction: str) -> str:
     """
     Main function to process content based on type.
     
@@ -150,16 +210,47 @@ def process_content(post_data: Dict[str, Any], remix_instruction: str) -> str:
         
         # Determine which function to call based on content type
         if platform == 'twitter' and content_type == 'thread':
-            return process_twitter_thread(post_data)
+            return await process_twitter_thread(post_data)
         elif platform in ['twitter', 'linkedin']:
-            return process_text_post(post_data)
+            return await process_text_post(post_data)
         elif platform in ['youtube', 'instagram', 'tiktok']:
-            return process_video_post(post_data)
+            return await process_video_post(post_data)
         else:
             # Default fallback
             logger.warning(f"Unknown platform/content type: {platform}/{content_type}")
             return f"[UNKNOWN CONTENT TYPE] Processing post {post_data.get('post_number', 'unknown')}"
             
+    except CompletionError:
+        raise
     except Exception as e:
         logger.error(f"Error processing content as script: {str(e)}")
-        return f"Error processing content as script: {str(e)}"
\ No newline at end of file
+        return f"Error processing content as script: {str(e)}"
+
+async def stream_content(post_data: Dict[str, Any], remix_instruction: str) -> AsyncIterator[str]:
+    """
+    Stream remixed script content as it is generated.
+    
+    Args:
+        post_data: The complete post data
+        remix_instruction: User's specific instruction for remixing
+        
+    Yields:
+        str: Successive fragments of the remixed content
+    """
+    post_number = post_data.get('post_number', 'unknown')
+    logger.info(f"Streaming post {post_number} as script")
+    
+    try:
+        prompt = await build_prompt(post_data)
+    except Exception as e:
+        logger.error(f"Error building script prompt: {str(e)}")
+        yield f"Error processing content as script: {str(e)}"
+        return
+    
+    if not prompt:
+        platform = post_data.get('platform', 'unknown')
+        yield f"[{platform.upper()} SCRIPT] Processing post {post_number} - No content available to remix"
+        return
+    
+    async for fragment in achat_completion_stream(prompt):
+        yield fragment
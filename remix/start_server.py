@@ -3,6 +3,7 @@
 Quick start script for AI Content Remix API
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
@@ -12,16 +13,16 @@ def main():
     print("AI Content Remix - Quick Start")
     print("=" * 40)
     
-    # Check if we're in the right directory
-    current_dir = Path.cwd()
-    main_file = current_dir / "main.py"
+    # remix is a package, so the server runs from the repository root
+    remix_dir = Path(__file__).resolve().parent
+    project_root = remix_dir.parent
+    main_file = remix_dir / "main.py"
     
     if not main_file.exists():
-        print("main.py not found in current directory")
-        print("Please run this script from the /remix directory")
+        print("main.py not found next to this script")
         return
     
-    print("Current directory:", current_dir)
+    print("Project root:", project_root)
     print("Found main.py - starting server...")
     print()
     
@@ -34,21 +35,32 @@ def main():
         print("Press Ctrl+C to stop the server")
         print("=" * 40)
         
+        # The remix service keeps no in-process task state, so it can run one
+        # worker per core. uvloop/httptools ship with uvicorn[standard]; fall
+        # back to uvicorn's defaults where they are unavailable (e.g. Windows).
+        workers = os.cpu_count() or 1
+        loop = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+        http = "httptools" if importlib.util.find_spec("httptools") else "auto"
+        print(f"Workers: {workers} | Loop: {loop} | HTTP: {http}")
+        
         # Run uvicorn without auto-reload to prevent task data loss
         subprocess.run([
             sys.executable, "-m", "uvicorn",
-            "main:app",
+            "remix.main:app",
             "--host", "0.0.0.0",
-            "--port", "8001"
+            "--port", "8001",
+            "--workers", str(workers),
+            "--loop", loop,
+            "--http", http
             # Removed --reload to prevent server restarts
-        ])
+        ], cwd=str(project_root))
         
     except KeyboardInterrupt:
         print("\nServer stopped by user")
     except Exception as e:
         print(f"Error starting server: {e}")
         print("Make sure you have installed all requirements:")
-        print("   pip install -r ../../requirements.txt")
+        print("   pip install -r requirements.txt")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,8 @@
+"""
+Error types shared across the remix service.
+Kept free of third-party imports so the API layer can always import them.
+"""
+
+
+class CompletionError(Exception):
+    """Raised when a GPT completion fails after the client's retries are exhausted"""
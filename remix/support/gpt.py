@@ -3,50 +3,215 @@ GPT support module for content remixing.
 Provides basic GPT completion functionality using OpenAI API.
 """
 
-import sys
+import asyncio
+import logging
 import os
-
-# Add the parent directory to the path to import admin.py
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from functools import cache
+from typing import AsyncIterator, Optional
 
 from admin import OPENAI_KEY, model
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI, OpenAIError
+
+from .errors import CompletionError
+from .llm_cache import llm_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+# Generation budget when the caller does not set one (long-form scripts)
+DEFAULT_MAX_TOKENS = 1000
+
+# Sampling temperature when the caller does not set one
+DEFAULT_TEMPERATURE = 0.7
+
+# Transient failures (connection errors, timeouts, 429 and 5xx responses) are
+# retried by the OpenAI client with exponential backoff and jitter
+MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', '5'))
+REQUEST_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', '60'))
+
+# Concurrent in-flight OpenAI requests per process; callers beyond this queue
+# locally instead of tripping the account's rate limits. Tune per OpenAI tier.
+MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '50'))
+_request_semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+# Connection pool limits shared by the sync and async clients
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Shared clients are built on first use rather than at import, so worker
+# start-up and tooling that never calls GPT don't pay for client/transport
+# construction. Afterwards every call reuses the same pooled keep-alive
+# HTTPS connections.
+@cache
+def get_client() -> OpenAI:
+    """Return the process-wide OpenAI client, creating it on first use"""
+    return OpenAI(
+        api_key=OPENAI_KEY,
+        max_retries=MAX_RETRIES,
+        timeout=REQUEST_TIMEOUT,
+        http_client=httpx.Client(limits=HTTP_LIMITS),
+    )
+
+
+@cache
+def get_async_client() -> AsyncOpenAI:
+    """Return the process-wide AsyncOpenAI client, creating it on first use"""
+    return AsyncOpenAI(
+        api_key=OPENAI_KEY,
+        max_retries=MAX_RETRIES,
+        timeout=REQUEST_TIMEOUT,
+        http_client=httpx.AsyncClient(limits=HTTP_LIMITS),
+    )
+
 
+def _completion_params(prompt: str, system_message: str, max_tokens: int = DEFAULT_MAX_TOKENS,
+                       model_name: Optional[str] = None, response_format: Optional[dict] = None,
+                       temperature: float = DEFAULT_TEMPERATURE) -> dict:
+    """Build the chat completion request parameters shared by both clients"""
+    params = {
+        "model": model_name or model,
+        "messages": [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+    }
+    if response_format:
+        params["response_format"] = response_format
+    return params
 
-def chat_completion(prompt: str, system_message: str = "You are a helpful assistant.") -> str:
+
+async def achat_completion(prompt: str, system_message: str = "You are a helpful assistant.",
+                           max_tokens: int = DEFAULT_MAX_TOKENS, model_name: Optional[str] = None,
+                           response_format: Optional[dict] = None,
+                           temperature: float = DEFAULT_TEMPERATURE) -> str:
     """
-    Basic chat completion function using OpenAI GPT.
+    Async chat completion function using OpenAI GPT.
     
     Args:
         prompt: The user prompt to send to GPT
         system_message: System message to guide the assistant behavior
+        max_tokens: Upper bound on generated tokens (latency scales with output length)
+        model_name: Optional model override, defaults to the configured model
+        response_format: Optional OpenAI response_format, e.g. {"type": "json_object"}
+        temperature: Sampling temperature; 0 gives deterministic, cacheable output
         
     Returns:
         str: The GPT response
+        
+    Raises:
+        CompletionError: If the request still fails after retries
+    """
+    try:
+        # Identical requests are served from the response cache
+        cache_key = make_cache_key(model_name or model, system_message, prompt, max_tokens=max_tokens,
+                                   response_format=response_format, temperature=temperature)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        client = get_async_client()
+
+        # Create chat completion without blocking the event loop
+        async with _request_semaphore:
+            response = await client.chat.completions.create(**_completion_params(prompt, system_message, max_tokens, model_name, response_format, temperature))
+
+        result = response.choices[0].message.content.strip()
+        await llm_cache.set(cache_key, result)
+        return result
+
+    except OpenAIError as e:
+        logger.error(f"Error in GPT completion: {str(e)}")
+        raise CompletionError(str(e)) from e
+
+
+async def achat_completion_stream(prompt: str, system_message: str = "You are a helpful assistant.",
+                                  max_tokens: int = DEFAULT_MAX_TOKENS, model_name: Optional[str] = None,
+                                  temperature: float = DEFAULT_TEMPERATURE) -> AsyncIterator[str]:
+    """
+    Streaming chat completion: yields text fragments as the model generates them.
+    
+    Args:
+        prompt: The user prompt to send to GPT
+        system_message: System message to guide the assistant behavior
+        max_tokens: Upper bound on generated tokens (latency scales with output length)
+        model_name: Optional model override, defaults to the configured model
+        temperature: Sampling temperature; 0 gives deterministic, cacheable output
+        
+    Yields:
+        str: Successive fragments of the GPT response
+        
+    Raises:
+        CompletionError: If the request fails after retries, or the stream breaks off
+    """
+    try:
+        # Cached responses are sent in one piece; full streams populate the same cache
+        cache_key = make_cache_key(model_name or model, system_message, prompt, max_tokens=max_tokens,
+                                   response_format=None, temperature=temperature)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+        client = get_async_client()
+        params = _completion_params(prompt, system_message, max_tokens, model_name, None, temperature)
+
+        # A stream holds its concurrency slot until generation finishes
+        parts = []
+        async with _request_semaphore:
+            stream = await client.chat.completions.create(**params, stream=True)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        result = "".join(parts).strip()
+        if result:
+            await llm_cache.set(cache_key, result)
+
+    except OpenAIError as e:
+        logger.error(f"Error in GPT streaming completion: {str(e)}")
+        raise CompletionError(str(e)) from e
+
+
+def chat_completion(prompt: str, system_message: str = "You are a helpful assistant.",
+                    max_tokens: int = DEFAULT_MAX_TOKENS, model_name: Optional[str] = None,
+                    response_format: Optional[dict] = None,
+                    temperature: float = DEFAULT_TEMPERATURE) -> str:
+    """
+    Synchronous chat completion for scripts and callers without a running event loop.
+    
+    Uses the pooled sync client rather than asyncio.run, since the shared async
+    client's connections are bound to the event loop that opened them.
+    
+    Args:
+        prompt: The user prompt to send to GPT
+        system_message: System message to guide the assistant behavior
+        max_tokens: Upper bound on generated tokens (latency scales with output length)
+        model_name: Optional model override, defaults to the configured model
+        response_format: Optional OpenAI response_format, e.g. {"type": "json_object"}
+        temperature: Sampling temperature; 0 gives deterministic, cacheable output
+        
+    Returns:
+        str: The GPT response
+        
+    Raises:
+        CompletionError: If the request still fails after retries
     """
     try:
-        # Initialize OpenAI client (new API v1.0+)
-        client = OpenAI(api_key=OPENAI_KEY)
-
-        # Create chat completion
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=1000,
-            temperature=0.7,
-        )
+        response = get_client().chat.completions.create(**_completion_params(prompt, system_message, max_tokens, model_name, response_format, temperature))
 
         return response.choices[0].message.content.strip()
 
-    except Exception as e:
-        print(f"Error in GPT completion: {str(e)}")
-        return f"Error generating content: {str(e)}"
+    except OpenAIError as e:
+        logger.error(f"Error in GPT completion: {str(e)}")
+        raise CompletionError(str(e)) from e
 
 
-# Example usage
+# Example usage (run from the repository root: python -m remix.support.gpt)
 if __name__ == "__main__":
     # Test the function
     test_prompt = "Write a short social media post about AI technology."
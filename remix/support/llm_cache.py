@@ -0,0 +1,96 @@
+"""
+LLM response cache for content remixing.
+Caches GPT completions keyed by a hash of the model, system message and prompt,
+so repeated posts and client retries skip the OpenAI round-trip entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+# Logging is configured by the application entry point
+logger = logging.getLogger(__name__)
+
+# Default time-to-live for cached responses (seconds)
+DEFAULT_TTL = 3600
+
+# Maximum number of responses kept in the in-process cache
+MAX_ENTRIES = 1024
+
+# Optional shared cache across workers/instances
+REDIS_URL = os.getenv('REDIS_URL')
+
+
+def make_cache_key(model: str, system_message: str, prompt: str, **params) -> str:
+    """Build a stable cache key for a chat completion request and its generation params"""
+    payload = json.dumps({"model": model, "sys": system_message, "prompt": prompt, **params}, sort_keys=True)
+    return "llm:" + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """In-memory LRU cache of strings with TTL, backed by Redis when REDIS_URL is configured"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, redis_url: Optional[str] = REDIS_URL):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._redis = None
+
+        if redis_url:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url, decode_responses=True)
+                logger.info("LLM cache using Redis backend")
+            except ImportError:
+                logger.warning("REDIS_URL set but redis package not installed, using in-memory LLM cache only")
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                return value
+            del self._entries[key]
+
+        if self._redis:
+            try:
+                # Read the remaining TTL with the value, so the in-memory copy
+                # never outlives the Redis entry
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    value, remaining = await pipe.execute()
+                if value is not None:
+                    # TTL is -1 for keys without an expiry
+                    ttl = DEFAULT_TTL if remaining < 0 else min(remaining, DEFAULT_TTL)
+                    if ttl > 0:
+                        self._remember(key, value, ttl)
+                    return value
+            except Exception as e:
+                logger.error(f"Error reading LLM cache from Redis: {str(e)}")
+        return None
+
+    async def set(self, key: str, value: str, ttl: int = DEFAULT_TTL):
+        """Store a response under key for ttl seconds"""
+        self._remember(key, value, ttl)
+
+        if self._redis:
+            try:
+                await self._redis.set(key, value, ex=ttl)
+            except Exception as e:
+                logger.error(f"Error writing LLM cache to Redis: {str(e)}")
+
+    def _remember(self, key: str, value: str, ttl: int):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Shared cache instance
+llm_cache = LLMCache()
@@ -3,67 +3,102 @@ Transcript support module for video content.
 Provides transcript functionality for YouTube, Instagram, and TikTok videos.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional, List
-from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any, Optional, List, Tuple
 import re
 import os
-import sys
-
-# Add the parent directory to the path to import admin.py
-parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
-sys.path.append(parent_dir)
-print(f"Added to sys.path: {parent_dir}")
-# Import Apify API key from admin.py
-try:
-    from admin import APIFY_KEY
-    
-except ImportError:
-    
-    APIFY_KEY = None
+from functools import cache, lru_cache
+from urllib.parse import urlsplit
+
+import orjson
+
+
+from .llm_cache import LLMCache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
+# Transcripts for recently remixed videos (Redis-backed when REDIS_URL is set),
+# so revisions of the same video skip the YouTube/Apify round-trip
+TRANSCRIPT_CACHE_TTL = 24 * 3600
+transcript_cache = LLMCache(max_entries=1024)
+
+# Apify clients retry 429 and 5xx responses themselves with exponential backoff
+APIFY_MAX_RETRIES = int(os.getenv('APIFY_MAX_RETRIES', '5'))
+APIFY_MIN_RETRY_DELAY_MS = int(os.getenv('APIFY_MIN_RETRY_DELAY_MS', '1000'))
+
+# Concurrent actor runs per process; further calls queue locally instead of
+# tripping the Apify plan's rate limits. Tune per Apify plan.
+APIFY_MAX_CONCURRENCY = int(os.getenv('APIFY_MAX_CONCURRENCY', '5'))
+_apify_semaphore = asyncio.Semaphore(APIFY_MAX_CONCURRENCY)
+
+# The actor works through its video_urls one at a time, so async batches are
+# split into shards of this many URLs that run as concurrent actor runs
+APIFY_SHARD_SIZE = int(os.getenv('APIFY_SHARD_SIZE', '5'))
+
+# A bare video ID: exactly 11 characters from YouTube's ID alphabet
+_YT_ID_ONLY = re.compile(r'^[0-9A-Za-z_-]{11}$')
+
+# Single-pass match for every YouTube URL form: watch?v=, shorts/, embed/,
+# youtu.be/, attribution_link (v%3D), ytscreeningroom and bare 11-char IDs
+_YT_ID_RE = re.compile(r'(?:^|/|%3D|v=|vi=|/shorts/|/embed/|youtu\.be/)([0-9A-Za-z_-]{11})(?:[?&#/%]|$)')
+
+# Hosts the Apify actor can transcribe per platform (post pages and CDN
+# video files); anything else is rejected before an actor run is billed
+_IG_RE = re.compile(r'(instagram\.com|fbcdn\.net|cdninstagram\.com)')
+_TT_RE = re.compile(r'tiktok(?:cdn(?:-[a-z]+)?|v)?\.com')
+VIDEO_URL_PATTERNS = {
+    'instagram': _IG_RE,
+    'tiktok': _TT_RE,
+}
+
+# Pure on its input, so repeat lookups (url and video_url fields, retries) hit the cache
+@lru_cache(maxsize=4096)
 def extract_youtube_video_id(url_or_id: str) -> Optional[str]:
     """
     Extract YouTube video ID from full URL (watch, shorts, embed, youtu.be)
     or return if it's already an ID.
     """
     # Already looks like a video ID
-    if len(url_or_id) == 11 and '/' not in url_or_id:
+    if _YT_ID_ONLY.match(url_or_id):
         return url_or_id
 
+    match = _YT_ID_RE.search(url_or_id)
+    return match.group(1) if match else None
+
+def is_valid_video_url(platform: str, video_url: str) -> bool:
+    """Cheap check that video_url points at the given Apify-backed platform"""
+    pattern = VIDEO_URL_PATTERNS.get(platform)
+    return bool(pattern and pattern.search(video_url))
+
+# Apify API key, loaded on first Apify call so importing this module (e.g. a
+# YouTube-only worker) doesn't have to load admin.py
+@cache
+def _apify_key() -> Optional[str]:
+    """Return the Apify API key from admin.py, falling back to the environment"""
     try:
-        parsed = urlparse(url_or_id)
-
-        if parsed.hostname in ['www.youtube.com', 'youtube.com']:
-            # Handle standard watch URL
-            if parsed.path == '/watch':
-                return parse_qs(parsed.query).get('v', [None])[0]
-            # Handle shorts URL: /shorts/<id>
-            if parsed.path.startswith('/shorts/'):
-                return parsed.path.split('/shorts/')[1].split('?')[0]
-            # Handle embed URL: /embed/<id>
-            if parsed.path.startswith('/embed/'):
-                return parsed.path.split('/embed/')[1].split('?')[0]
-
-        elif parsed.hostname == 'youtu.be':
-            return parsed.path[1:]
-    except Exception:
-        pass
-
-    # Regex fallback (covers more exotic cases)
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/|youtube\.com\/shorts\/)([^&\n?#]+)'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url_or_id)
-        if match:
-            return match.group(1)
+        from admin import APIFY_KEY
+        return APIFY_KEY
+    except ImportError:
+        return os.getenv('APIFY_KEY')
 
-    return None
+# Shared transcript client, built on first use like the OpenAI clients. Its
+# pooled requests Session reuses keep-alive TLS connections to YouTube across
+# videos and retries transient failures with backoff.
+@cache
+def get_ytt_api():
+    """Return the process-wide YouTubeTranscriptApi, creating it on first use"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from youtube_transcript_api import YouTubeTranscriptApi
+
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    session.mount('https://', HTTPAdapter(pool_connections=64, pool_maxsize=64, max_retries=retry))
+    return YouTubeTranscriptApi(http_client=session)
 
 def get_youtube_transcript(video_url: str) -> Optional[str]:
     """
@@ -76,8 +111,6 @@ def get_youtube_transcript(video_url: str) -> Optional[str]:
         str: The transcript text or None if failed
     """
     try:
-        from youtube_transcript_api import YouTubeTranscriptApi
-
         # Extract video ID from YouTube URL
         video_id = extract_youtube_video_id(video_url)
         if not video_id:
@@ -86,17 +119,15 @@ def get_youtube_transcript(video_url: str) -> Optional[str]:
 
         logger.info(f"Fetching transcript for video ID: {video_id}")
 
-        # Use new API: instantiate and call fetch()
-        ytt_api = YouTubeTranscriptApi()
-        fetched_transcript = ytt_api.fetch(video_id)
+        fetched_transcript = get_ytt_api().fetch(video_id)
 
         # Convert to raw data if available
         if hasattr(fetched_transcript, "to_raw_data"):
             raw_data = fetched_transcript.to_raw_data()
-            text = "\n".join([part["text"] for part in raw_data if part.get("text")])
+            text = "\n".join(part["text"] for part in raw_data if part.get("text"))
         else:
             # fallback if fetch returns list-like already
-            text = "\n".join([getattr(part, "text", part.get("text", "")) for part in fetched_transcript])
+            text = "\n".join(getattr(part, "text", part.get("text", "")) for part in fetched_transcript)
 
         logger.info(f"Successfully retrieved YouTube transcript for video {video_id}")
         return text.strip() if text else None
@@ -105,6 +136,157 @@ def get_youtube_transcript(video_url: str) -> Optional[str]:
         logger.error(f"Error getting YouTube transcript: {str(e)}")
         return None
 
+async def aget_youtube_transcript(video_url: str) -> Optional[str]:
+    """
+    Async version of get_youtube_transcript.
+    
+    youtube-transcript-api has no async client, so the fetch runs in a worker
+    thread to keep the event loop free.
+    """
+    # Key on the video ID so every URL form of a video shares one entry
+    video_id = extract_youtube_video_id(video_url)
+    cache_key = f"yt:transcript:{video_id}" if video_id else None
+    if cache_key:
+        text = await transcript_cache.get(cache_key)
+        if text is not None:
+            logger.info(f"Transcript cache hit for YouTube video {video_id}")
+            return text
+        logger.info(f"Transcript cache miss for YouTube video {video_id}")
+
+    text = await asyncio.to_thread(get_youtube_transcript, video_url)
+    if text and cache_key:
+        await transcript_cache.set(cache_key, text, ttl=TRANSCRIPT_CACHE_TTL)
+    return text
+
+def _extract(field: Any) -> Optional[str]:
+    """Return the text of a transcript field, which Apify sends as a {"text": ...} dict or a plain string"""
+    if isinstance(field, dict):
+        return field.get("text")
+    if isinstance(field, str):
+        return field
+    return None
+
+def _apify_item_text(item: Dict[str, Any]) -> str:
+    """Extract the transcript text from one Apify dataset item, newline-terminated"""
+    # Extract transcript from the proper structure based on the schema
+    # Check for target_transcript first (translated text), then fall back
+    # to source_transcript
+    if item.get("target_transcript"):
+        text = _extract(item["target_transcript"])
+    elif item.get("source_transcript"):
+        text = _extract(item["source_transcript"])
+
+    # Final fallback to direct transcript field
+    elif "transcript" in item:
+        text = item["transcript"]
+
+    # Also check for translation field as a fallback
+    elif "translation" in item:
+        text = "\nTranslation:\n" + item["translation"]
+    else:
+        text = None
+
+    return text + "\n" if text is not None else ""
+
+def _apify_transcript_text(items: Optional[List[Dict[str, Any]]], video_urls: List[str]) -> Optional[str]:
+    """Combine the transcript text of all Apify dataset items"""
+    if items is None:
+        return None
+    
+    transcript_text = "".join([_apify_item_text(item) for item in items])
+    
+    if transcript_text:
+        logger.info(f"Successfully retrieved transcript from Apify for {len(video_urls)} videos")
+        return transcript_text.strip()
+    else:
+        logger.warning("No transcript data found in Apify response")
+        return None
+
+def _run_apify_actor(video_urls: List[str], target_lang: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Run the video-transcript actor once for all video_urls and return its dataset items.
+    
+    Returns:
+        list: The dataset items, or None if APIFY_KEY is missing
+    """
+    # Check if Apify key is available
+    apify_key = _apify_key()
+    if not apify_key:
+        logger.error("APIFY_KEY not found in admin.py")
+        return None
+        
+    # Import Apify client
+    from apify_client import ApifyClient
+    
+    # Initialize the ApifyClient with your Apify API token
+    client = ApifyClient(apify_key, max_retries=APIFY_MAX_RETRIES,
+                         min_delay_between_retries_millis=APIFY_MIN_RETRY_DELAY_MS)
+
+    # Prepare the Actor input
+    run_input = {
+        "video_urls": video_urls,
+        "target_lang": target_lang
+    }
+
+    # Run the Actor and wait for it to finish
+    run = client.actor("agentx/video-transcript").call(run_input=run_input)
+
+    # Fetch Actor results from the run's dataset in one download and parse
+    # them with orjson rather than paging through iterate_items
+    items = orjson.loads(client.dataset(run["defaultDatasetId"]).get_items_as_bytes(item_format='json'))
+    
+    # Log the complete response for debugging; items can carry whole
+    # transcripts, so only format them when DEBUG is enabled
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Apify response items: %s", items)
+    return items
+
+async def _arun_apify_actor(video_urls: List[str], target_lang: str) -> Optional[List[Dict[str, Any]]]:
+    """Async version of _run_apify_actor using ApifyClientAsync"""
+    apify_key = _apify_key()
+    if not apify_key:
+        logger.error("APIFY_KEY not found in admin.py")
+        return None
+        
+    from apify_client import ApifyClientAsync
+    
+    client = ApifyClientAsync(apify_key, max_retries=APIFY_MAX_RETRIES,
+                              min_delay_between_retries_millis=APIFY_MIN_RETRY_DELAY_MS)
+    run_input = {
+        "video_urls": video_urls,
+        "target_lang": target_lang
+    }
+
+    # Await the actor run without blocking the event loop; a run holds its
+    # concurrency slot until it finishes
+    async with _apify_semaphore:
+        run = await client.actor("agentx/video-transcript").call(run_input=run_input)
+
+    items = orjson.loads(await client.dataset(run["defaultDatasetId"]).get_items_as_bytes(item_format='json'))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Apify response items: %s", items)
+    return items
+
+async def _arun_apify_shards(video_urls: List[str], target_lang: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Run the actor over video_urls in concurrent shards of APIFY_SHARD_SIZE URLs,
+    bounded by the Apify concurrency limit, and return the items in URL order.
+    
+    Returns:
+        list: The dataset items, or None if APIFY_KEY is missing
+    """
+    results = [items for _, items in await _arun_apify_shard_runs(video_urls, target_lang)]
+    
+    if all(result is None for result in results):
+        return None
+    return [item for result in results if result for item in result]
+
+async def _arun_apify_shard_runs(video_urls: List[str], target_lang: str) -> List[Tuple[List[str], Optional[List[Dict[str, Any]]]]]:
+    """Run the actor over concurrent shards of video_urls; returns (shard URLs, dataset items or None) per shard, in order"""
+    shards = [video_urls[i:i + APIFY_SHARD_SIZE] for i in range(0, len(video_urls), APIFY_SHARD_SIZE)]
+    results = await asyncio.gather(*(_arun_apify_actor(shard, target_lang) for shard in shards))
+    return list(zip(shards, results))
+
 def get_apify_transcript(video_urls: List[str], target_lang: str = "English") -> Optional[str]:
     """
     Get transcript for videos using Apify's video-transcript actor.
@@ -117,72 +299,152 @@ def get_apify_transcript(video_urls: List[str], target_lang: str = "English") ->
         str: The transcript text or None if failed
     """
     try:
-        # Check if Apify key is available
-        if not APIFY_KEY:
-            logger.error("APIFY_KEY not found in admin.py")
-            return None
+        items = _run_apify_actor(video_urls, target_lang)
+        return _apify_transcript_text(items, video_urls)
             
-        # Import Apify client
-        from apify_client import ApifyClient
+    except Exception as e:
+        logger.error(f"Error getting Apify transcript: {str(e)}")
+        return None
+
+def _apify_cache_key(video_urls: List[str], target_lang: str) -> str:
+    """transcript_cache key of the combined transcript of video_urls"""
+    url_hash = hashlib.sha1("\n".join(video_urls).encode('utf-8')).hexdigest()
+    return f"apify:transcript:{url_hash}:{target_lang}"
+
+async def aget_apify_transcript(video_urls: List[str], target_lang: str = "English") -> Optional[str]:
+    """
+    Async version of get_apify_transcript using ApifyClientAsync, so the event
+    loop keeps serving requests while the actor runs.
+    
+    Args:
+        video_urls: List of video URLs to transcribe
+        target_lang: Target language for translation
         
-        # Initialize the ApifyClient with your Apify API token
-        client = ApifyClient(APIFY_KEY)
+    Returns:
+        str: The transcript text or None if failed
+    """
+    try:
+        cache_key = _apify_cache_key(video_urls, target_lang)
+        text = await transcript_cache.get(cache_key)
+        if text is not None:
+            logger.info(f"Transcript cache hit for {len(video_urls)} Apify videos")
+            return text
+        logger.info(f"Transcript cache miss for {len(video_urls)} Apify videos")
+
+        items = await _arun_apify_shards(video_urls, target_lang)
+        text = _apify_transcript_text(items, video_urls)
+        if text:
+            await transcript_cache.set(cache_key, text, ttl=TRANSCRIPT_CACHE_TTL)
+        return text
+            
+    except Exception as e:
+        logger.error(f"Error getting Apify transcript: {str(e)}")
+        return None
 
-        # Prepare the Actor input
-        run_input = {
-            "video_urls": video_urls,
-            "target_lang": target_lang
-        }
+def _post_video_urls(platform: str, posts: List[Dict[Any, Any]]) -> List[str]:
+    """Unique, valid video URLs of the given posts, in order"""
+    video_urls = []
+    for post in posts:
+        video_url = post.get('video_url') or post.get('url')
+        if not video_url or video_url in video_urls:
+            continue
+        if not is_valid_video_url(platform, video_url):
+            logger.error(f"Not a {platform} video URL: {video_url}")
+            continue
+        video_urls.append(video_url)
+    return video_urls
 
-        # Run the Actor and wait for it to finish
-        run = client.actor("agentx/video-transcript").call(run_input=run_input)
+def _normalize_video_url(url: str) -> str:
+    """Host and path of a video URL, so the actor's echo of a URL (scheme, www.,
+    trailing slash or query string changed) still matches the one requested"""
+    parts = urlsplit(url.strip())
+    return parts.netloc.lower().removeprefix('www.') + parts.path.rstrip('/')
 
-        # Fetch and process Actor results from the run's dataset
-        transcript_text = ""
-        items = list(client.dataset(run["defaultDatasetId"]).iterate_items())
+def _transcripts_by_url(items: Optional[List[Dict[str, Any]]], video_urls: List[str]) -> Dict[str, Optional[str]]:
+    """
+    Match the dataset items of one actor run back to the video URLs it was given.
+    
+    Items are matched on their normalized video_url. Only when none of them
+    matches that way and the run returned exactly one item per URL are they
+    matched by position instead; an item that can't be matched is dropped
+    rather than risk attaching it to another video.
+    """
+    texts: Dict[str, List[str]] = {url: [] for url in video_urls}
+    if items is None:
+        return dict.fromkeys(video_urls)
+    
+    by_key = {_normalize_video_url(url): url for url in video_urls}
+    matched = [by_key.get(_normalize_video_url(item.get('video_url') or item.get('url') or '')) for item in items]
+    if len(items) == len(video_urls) and not any(matched):
+        matched = video_urls
+    
+    for item, video_url in zip(items, matched):
+        if video_url is None:
+            logger.warning(f"Apify item for unrequested video: {item.get('video_url')}")
+            continue
+        texts[video_url].append(_apify_item_text(item))
+    
+    # Joined and stripped like _apify_transcript_text, so each entry equals the
+    # transcript a single-video run would have produced
+    return {url: "".join(parts).strip() or None for url, parts in texts.items()}
+
+async def aget_bulk_transcripts(platform: str, posts: List[Dict[Any, Any]], target_lang: str = "English") -> Dict[str, Optional[str]]:
+    """
+    Get transcripts for several Instagram or TikTok posts in shared Apify actor
+    runs (APIFY_SHARD_SIZE videos per run) instead of one run per video.
+    
+    Transcripts are read from and written to transcript_cache per video, under
+    the same key aget_apify_transcript uses for a single video.
+    
+    Args:
+        platform: The platform (instagram, tiktok)
+        posts: The video post data
+        target_lang: Target language for translation
         
-        # Log the complete response for debugging
-        logger.info(f"Apify response items: {items}")
+    Returns:
+        dict: Video URL -> transcript text (None for videos without a transcript)
+    """
+    platform = platform.lower()
+    video_urls = _post_video_urls(platform, posts)
+    transcripts: Dict[str, Optional[str]] = {}
+    
+    try:
+        missing = []
+        for video_url in video_urls:
+            text = await transcript_cache.get(_apify_cache_key([video_url], target_lang))
+            if text is not None:
+                transcripts[video_url] = text
+            else:
+                missing.append(video_url)
+        if not missing:
+            return transcripts
         
-        for item in items:
-            # Log each item for debugging
-            logger.info(f"Apify item: {item}")
-            
-            # Extract transcript from the proper structure based on the schema
-            # Check for target_transcript first (translated text)
-            if "target_transcript" in item and item["target_transcript"]:
-                target_transcript = item["target_transcript"]
-                if isinstance(target_transcript, dict) and "text" in target_transcript:
-                    transcript_text += target_transcript["text"] + "\n"
-                elif isinstance(target_transcript, str):
-                    transcript_text += target_transcript + "\n"
-            
-            # Fallback to source_transcript if target_transcript not available
-            elif "source_transcript" in item and item["source_transcript"]:
-                source_transcript = item["source_transcript"]
-                if isinstance(source_transcript, dict) and "text" in source_transcript:
-                    transcript_text += source_transcript["text"] + "\n"
-                elif isinstance(source_transcript, str):
-                    transcript_text += source_transcript + "\n"
-            
-            # Final fallback to direct transcript field
-            elif "transcript" in item:
-                transcript_text += item["transcript"] + "\n"
-            
-            # Also check for translation field as a fallback
-            elif "translation" in item:
-                transcript_text += "\nTranslation:\n" + item["translation"] + "\n"
+        logger.info(f"Getting {len(missing)} {platform} transcripts using Apify ({len(transcripts)} cached)")
+        for shard, items in await _arun_apify_shard_runs(missing, target_lang):
+            transcripts.update(_transcripts_by_url(items, shard))
         
-        if transcript_text:
-            logger.info(f"Successfully retrieved transcript from Apify for {len(video_urls)} videos")
-            return transcript_text.strip()
-        else:
-            logger.warning("No transcript data found in Apify response")
-            return None
-            
+        for video_url in missing:
+            if transcripts[video_url]:
+                await transcript_cache.set(_apify_cache_key([video_url], target_lang), transcripts[video_url], ttl=TRANSCRIPT_CACHE_TTL)
+        logger.info(f"Retrieved {sum(1 for url in missing if transcripts[url])} of {len(missing)} {platform} transcripts from Apify")
     except Exception as e:
-        logger.error(f"Error getting Apify transcript: {str(e)}")
-        return None
+        logger.error(f"Error getting bulk {platform} transcripts: {str(e)}")
+    
+    return {url: transcripts.get(url) for url in video_urls}
+
+async def aprefetch_transcripts(posts: List[Dict[Any, Any]]):
+    """
+    Fetch the transcripts of a batch's Instagram and TikTok video posts together
+    (one set of actor runs per platform) into transcript_cache, so remixing each
+    post afterwards reads its transcript from the cache.
+    """
+    posts_by_platform: Dict[str, List[Dict[Any, Any]]] = {}
+    for post in posts:
+        platform = post.get('platform', '').lower()
+        if platform in VIDEO_URL_PATTERNS:
+            posts_by_platform.setdefault(platform, []).append(post)
+    
+    await asyncio.gather(*(aget_bulk_transcripts(platform, platform_posts) for platform, platform_posts in posts_by_platform.items()))
 
 def get_instagram_transcript(post_data: Dict[Any, Any]) -> Optional[str]:
     """
@@ -202,6 +464,9 @@ def get_instagram_transcript(post_data: Dict[Any, Any]) -> Optional[str]:
         if not video_url:
             logger.error("No video URL found in Instagram post data")
             return None
+        if not is_valid_video_url('instagram', video_url):
+            logger.error(f"Not a Instagram video URL: {video_url}")
+            return None
             
         # Get transcript using Apify
         transcript = get_apify_transcript([video_url])
@@ -229,6 +494,9 @@ def get_tiktok_transcript(post_data: Dict[Any, Any]) -> Optional[str]:
         if not video_url:
             logger.error("No video URL found in TikTok post data")
             return None
+        if not is_valid_video_url('tiktok', video_url):
+            logger.error(f"Not a TikTok video URL: {video_url}")
+            return None
             
         # Get transcript using Apify
         transcript = get_apify_transcript([video_url])
@@ -238,6 +506,32 @@ def get_tiktok_transcript(post_data: Dict[Any, Any]) -> Optional[str]:
         logger.error(f"Error getting TikTok transcript: {str(e)}")
         return None
 
+async def _aget_youtube_post_transcript(video_data: Dict[Any, Any], video_url: Optional[str]) -> Optional[str]:
+    return await aget_youtube_transcript(video_url) if video_url else None
+
+async def _aget_apify_post_transcript(video_data: Dict[Any, Any], platform: str) -> Optional[str]:
+    video_url = video_data.get('video_url') or video_data.get('url')
+    if not video_url:
+        logger.error(f"No video URL found in {platform} post data")
+        return None
+    if not is_valid_video_url(platform, video_url):
+        logger.error(f"Not a {platform} video URL: {video_url}")
+        return None
+    return await aget_apify_transcript([video_url])
+
+# Platform -> transcript fetcher taking (video_data, video_url)
+_DISPATCH = {
+    'youtube': lambda data, url: get_youtube_transcript(url) if url else None,
+    'instagram': lambda data, url: get_instagram_transcript(data),
+    'tiktok': lambda data, url: get_tiktok_transcript(data),
+}
+
+_ASYNC_DISPATCH = {
+    'youtube': _aget_youtube_post_transcript,
+    'instagram': lambda data, url: _aget_apify_post_transcript(data, 'instagram'),
+    'tiktok': lambda data, url: _aget_apify_post_transcript(data, 'tiktok'),
+}
+
 def get_video_transcript(platform: str, video_data: Dict[Any, Any], video_url: str = None) -> Optional[str]:
     """
     Main function to get video transcript based on platform.
@@ -251,34 +545,35 @@ def get_video_transcript(platform: str, video_data: Dict[Any, Any], video_url: s
         str: The transcript text or None if failed
     """
     try:
-        platform = platform.lower()
-        
-        if platform == 'youtube' and video_url:
-            return get_youtube_transcript(video_url)
-        elif platform == 'instagram':
-            return get_instagram_transcript(video_data)
-        elif platform == 'tiktok':
-            return get_tiktok_transcript(video_data)
-        else:
+        handler = _DISPATCH.get(platform.lower())
+        if not handler:
             logger.warning(f"Unsupported platform for transcript: {platform}")
             return None
+        return handler(video_data, video_url)
             
     except Exception as e:
         logger.error(f"Error getting video transcript for {platform}: {str(e)}")
         return None
 
-# Example usage
-if __name__ == "__main__":
-    #Test with TikTok URL from your test data
-    test_data = {
-        "url": "https://www.instagram.com/p/DOEnN-nj7jS/",
-        "video_url": "https://instagram.fcae1-1.fna.fbcdn.net/o1/v/t16/f2/m86/AQM6hbiJZKShbpQq3VkYzhc35U-0xf5Mv23_X5xadQrimEq6CCGkFfg09-VEYL2T7bCK_LBxGvP9MgudVQhE3r75FRLNfk6exIMTlWQ.mp4?stp=dst-mp4&efg=eyJxZV9ncm91cHMiOiJbXCJpZ193ZWJfZGVsaXZlcnlfdnRzX290ZlwiXSIsInZlbmNvZGVfdGFnIjoidnRzX3ZvZF91cmxnZW4uY2xpcHMuYzIuNzIwLmJhc2VsaW5lIn0&_nc_cat=108&vs=764817839579715_3557508775&_nc_vs=HBksFQIYUmlnX3hwdl9yZWVsc19wZXJtYW5lbnRfc3JfcHJvZC84RDREMUI3QzJCMkNGNDBBQUQzMjIxNEYzMDE1NzA5MV92aWRlb19kYXNoaW5pdC5tcDQVAALIARIAFQIYOnBhc3N0aHJvdWdoX2V2ZXJzdG9yZS9HR3pKRENCVTEyTGNiNFVDQURTeTVaQkxaV04zYnFfRUFBQUYVAgLIARIAKAAYABsAFQAAJo7cxoz%2BqNY%2FFQIoAkMzLBdAQwU%2FfO2RaBgSZGFzaF9iYXNlbGluZV8xX3YxEQB1%2Fgdl5p0BAA%3D%3D&_nc_rid=e99228b883&ccb=9-4&oh=00_AfaAEExOwNQ9M8ty-0F3eOgmbZcm8s78LAQbbzKUo2bXyw&oe=68BA9AF5&_nc_sid=10d13b"
-    }
+async def aget_video_transcript(platform: str, video_data: Dict[Any, Any], video_url: str = None) -> Optional[str]:
+    """
+    Async version of get_video_transcript.
     
-    print("Testing instagram transcript extraction...")
-    transcript = get_instagram_transcript(test_data)
-    if transcript:
-        print("instagram Transcript:")
-        print(transcript)
-    else:
-        print("Failed to get instagram transcript")
\ No newline at end of file
+    Args:
+        platform: The platform (youtube, instagram, tiktok)
+        video_data: The video post data
+        video_url: Optional video URL (required for YouTube)
+        
+    Returns:
+        str: The transcript text or None if failed
+    """
+    try:
+        handler = _ASYNC_DISPATCH.get(platform.lower())
+        if not handler:
+            logger.warning(f"Unsupported platform for transcript: {platform}")
+            return None
+        return await handler(video_data, video_url)
+            
+    except Exception as e:
+        logger.error(f"Error getting video transcript for {platform}: {str(e)}")
+        return None
@@ -0,0 +1,25 @@
+"""
+Manual check of Instagram transcript extraction against the live Apify actor.
+Run from the repository root: python -m remix.test_transcript
+"""
+
+import logging
+
+from remix.support.transcript import get_instagram_transcript
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    #Test with TikTok URL from your test data
+    test_data = {
+        "url": "https://www.instagram.com/p/DOEnN-nj7jS/",
+        "video_url": "https://instagram.fcae1-1.fna.fbcdn.net/o1/v/t16/f2/m86/AQM6hbiJZKShbpQq3VkYzhc35U-0xf5Mv23_X5xadQrimEq6CCGkFfg09-VEYL2T7bCK_LBxGvP9MgudVQhE3r75FRLNfk6exIMTlWQ.mp4?stp=dst-mp4&efg=eyJxZV9ncm91cHMiOiJbXCJpZ193ZWJfZGVsaXZlcnlfdnRzX290ZlwiXSIsInZlbmNvZGVfdGFnIjoidnRzX3ZvZF91cmxnZW4uY2xpcHMuYzIuNzIwLmJhc2VsaW5lIn0&_nc_cat=108&vs=764817839579715_3557508775&_nc_vs=HBksFQIYUmlnX3hwdl9yZWVsc19wZXJtYW5lbnRfc3JfcHJvZC84RDREMUI3QzJCMkNGNDBBQUQzMjIxNEYzMDE1NzA5MV92aWRlb19kYXNoaW5pdC5tcDQVAALIARIAFQIYOnBhc3N0aHJvdWdoX2V2ZXJzdG9yZS9HR3pKRENCVTEyTGNiNFVDQURTeTVaQkxaV04zYnFfRUFBQUYVAgLIARIAKAAYABsAFQAAJo7cxoz%2BqNY%2FFQIoAkMzLBdAQwU%2FfO2RaBgSZGFzaF9iYXNlbGluZV8xX3YxEQB1%2Fgdl5p0BAA%3D%3D&_nc_rid=e99228b883&ccb=9-4&oh=00_AfaAEExOwNQ9M8ty-0F3eOgmbZcm8s78LAQbbzKUo2bXyw&oe=68BA9AF5&_nc_sid=10d13b"
+    }
+    
+    print("Testing instagram transcript extraction...")
+    transcript = get_instagram_transcript(test_data)
+    if transcript:
+        print("instagram Transcript:")
+        print(transcript)
+    else:
+        print("Failed to get instagram transcript")
\ No newline at end of file
@@ -3,21 +3,30 @@ Main FastAPI application for AI Content Suggestor.
 Orchestrates the complete social media scraping and content processing pipeline.
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, validator
-from typing import List, Optional, Dict, Any
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Tuple
 import uvicorn
 from datetime import datetime
 import logging
 import re
 import os
-import sys
-import json
-import subprocess
+import orjson
+import asyncio
+import sqlite3
+import threading
+import time
+import importlib
 import tempfile
 import shutil
 from pathlib import Path
+from dataclasses import dataclass
+from types import ModuleType
+from functools import cache, lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 # Import configuration
 try:
@@ -54,45 +63,147 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Storage for processing tasks with file persistence
+# Compress larger responses (completed /results payloads) for clients sending Accept-Encoding: gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Tasks are persisted as rows of a single SQLite table keyed by task_id;
+# processing_tasks is a bounded in-memory front for it
 processing_tasks = {}
+TASK_CACHE_SIZE = 512
+
+# Set when a running task finishes, waking long-polling /results requests
+_task_finished: Dict[str, asyncio.Event] = {}
+
+# Longest a /results?wait= long-poll is held open (seconds)
+MAX_RESULT_WAIT = 60
+
+# Writes batched by the background task writer are at most this far behind (seconds)
+TASK_SAVE_INTERVAL = 0.05
+
+# Resolved once; the directory is created when the task store is first opened
+TASKS_DIR = Path(get_storage_path())
+
+_tasks_db_lock = threading.Lock()
+
+@cache
+def _tasks_db() -> sqlite3.Connection:
+    """Open (once) the task store under the storage path"""
+    TASKS_DIR.mkdir(exist_ok=True, parents=True)
+    # Shared by the event loop and the writer thread; access is serialized by _tasks_db_lock
+    conn = sqlite3.connect(TASKS_DIR / 'tasks.db', isolation_level=None, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('CREATE TABLE IF NOT EXISTS tasks (id TEXT PRIMARY KEY, updated REAL, data BLOB)')
+    return conn
 
-def save_task_to_file(task_id: str, task_data: Dict[str, Any]):
-    """Save task data to file for persistence"""
+def _write_task_bytes(task_id: str, payload: bytes):
+    """Upsert an already-serialized task"""
+    conn = _tasks_db()
+    with _tasks_db_lock:
+        conn.execute('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?)', (task_id, time.time(), payload))
+
+def save_task(task_id: str, task_data: Dict[str, Any]):
+    """Save task data to the task store for persistence"""
     try:
-        tasks_dir = Path(get_storage_path())
-        tasks_dir.mkdir(exist_ok=True, parents=True)
-        task_file = tasks_dir / f'{task_id}.json'
-        
-        with open(task_file, 'w', encoding='utf-8') as f:
-            json.dump(task_data, f, indent=2, ensure_ascii=False)
+        _write_task_bytes(task_id, orjson.dumps(task_data, option=orjson.OPT_NON_STR_KEYS))
     except Exception as e:
         logger.error(f"Error saving task {task_id}: {e}")
 
-def load_task_from_file(task_id: str) -> Optional[Dict[str, Any]]:
-    """Load task data from file"""
+@cache
+def _legacy_task_ids() -> frozenset:
+    """Task ids of the pre-SQLite <task_id>.json files; scanned once since none are written anymore"""
     try:
-        tasks_dir = Path(get_storage_path())
-        task_file = tasks_dir / f'{task_id}.json'
-        
-        if task_file.exists():
-            with open(task_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+        with os.scandir(TASKS_DIR) as entries:
+            return frozenset(entry.name[:-5] for entry in entries if entry.name.endswith('.json') and entry.is_file())
+    except FileNotFoundError:
+        return frozenset()
+
+def load_task(task_id: str) -> Optional[Dict[str, Any]]:
+    """Load task data from the task store"""
+    try:
+        conn = _tasks_db()
+        with _tasks_db_lock:
+            row = conn.execute('SELECT data FROM tasks WHERE id = ?', (task_id,)).fetchone()
+        if row:
+            return orjson.loads(row[0])
+        
+        # Tasks saved before the move to SQLite live in <task_id>.json files
+        if task_id in _legacy_task_ids():
+            return orjson.loads((TASKS_DIR / f'{task_id}.json').read_bytes())
     except Exception as e:
         logger.error(f"Error loading task {task_id}: {e}")
     return None
 
+def cache_task(task_id: str, task_data: Dict[str, Any]):
+    """Keep a task in memory, evicting the oldest finished tasks past TASK_CACHE_SIZE"""
+    processing_tasks[task_id] = task_data
+    overflow = len(processing_tasks) - TASK_CACHE_SIZE
+    if overflow > 0:
+        # Running tasks are updated in place by their pipeline, so only finished ones go
+        finished = [tid for tid, task in processing_tasks.items() if task.get('status') != 'processing']
+        for tid in finished[:overflow]:
+            del processing_tasks[tid]
+
+# Background task writer: request handlers and the pipeline only enqueue the
+# task; one writer task persists the latest state of each queued task, so
+# back-to-back updates of the same task cost a single write
+_task_save_queue: Optional[asyncio.Queue] = None
+_task_writer: Optional[asyncio.Task] = None
+
+def queue_task_save(task_id: str):
+    """Schedule processing_tasks[task_id] to be persisted without blocking the caller"""
+    task_data = processing_tasks[task_id]
+    if _task_save_queue is None:
+        # Writer not running (e.g. pipeline driven outside the app); save inline
+        save_task(task_id, task_data)
+        return
+    # Queue the dict itself so the save still happens if it is evicted from memory
+    _task_save_queue.put_nowait((task_id, task_data))
+
+async def _save_queued_tasks(tasks: Dict[str, Dict[str, Any]]):
+    """Persist the current state of each task; serialized on the loop, written in a thread"""
+    for task_id, task_data in tasks.items():
+        try:
+            payload = orjson.dumps(task_data, option=orjson.OPT_NON_STR_KEYS)
+            await asyncio.to_thread(_write_task_bytes, task_id, payload)
+        except Exception as e:
+            logger.error(f"Error saving task {task_id}: {e}")
+
+async def _run_task_writer(queue: asyncio.Queue):
+    """Drain the save queue in batches until the None sentinel arrives"""
+    while True:
+        batch = [await queue.get()]
+        await asyncio.sleep(TASK_SAVE_INTERVAL)
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        
+        # De-duplicate by task_id while keeping first-queued order
+        tasks = dict(entry for entry in batch if entry is not None)
+        await _save_queued_tasks(tasks)
+        if None in batch:
+            return
+
+@app.on_event("startup")
+async def start_task_writer():
+    """Start the background task writer"""
+    global _task_save_queue, _task_writer
+    _task_save_queue = asyncio.Queue()
+    _task_writer = asyncio.create_task(_run_task_writer(_task_save_queue))
+
+@app.on_event("shutdown")
+async def stop_task_writer():
+    """Flush pending task saves and stop the writer"""
+    global _task_save_queue, _task_writer
+    if _task_save_queue is None:
+        return
+    _task_save_queue.put_nowait(None)
+    await _task_writer
+    _task_save_queue = None
+    _task_writer = None
+
 # Pydantic Models
 class ContentRequest(BaseModel):
-    urls: List[str]
-    
-    @validator('urls')
-    def validate_urls(cls, v):
-        if len(v) < 1:
-            raise ValueError('At least 1 URL is required')
-        if len(v) > 10:
-            raise ValueError('Maximum 10 URLs allowed')
-        return v
+    # 1-10 URLs; the bounds are enforced by pydantic-core, no Python validator
+    urls: List[str] = Field(..., min_length=1, max_length=10)
 
 class ProcessingResult(BaseModel):
     task_id: str
@@ -105,143 +216,108 @@ class ProcessingResult(BaseModel):
     completed_at: Optional[str] = None
 
 # Platform Detection and URL Processing
+# Pipeline stages are imported once and run in-process instead of spawning a
+# fresh interpreter per step. Resolves both as scrape.main (project root) and
+# as main (from the scrape folder).
+_PACKAGE_PREFIX = f"{__package__}." if __package__ else ""
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """Everything the pipeline needs to know about one platform"""
+    hosts: Tuple[str, ...]  # Registered domains; subdomains are matched by stripping the first label
+    username_re: re.Pattern  # Group 1 is the handle
+    scraper: ModuleType  # scrapers.<platform>, exposes run(url)
+
+def _load_scraper(platform: str) -> ModuleType:
+    return importlib.import_module(f"{_PACKAGE_PREFIX}scrapers.{platform}")
+
+# Single registry keyed by platform; regexes are compiled once at import
+PLATFORMS: Dict[str, PlatformSpec] = {
+    'instagram': PlatformSpec(('instagram.com',), re.compile(r'instagram\.com/([^/?]+)'), _load_scraper('instagram')),
+    'linkedin': PlatformSpec(('linkedin.com',), re.compile(r'linkedin\.com/(?:in|company)/([^/?]+)'), _load_scraper('linkedin')),
+    'twitter': PlatformSpec(('twitter.com', 'x.com'), re.compile(r'(?:twitter|x)\.com/([^/?]+)'), _load_scraper('twitter')),
+    'youtube': PlatformSpec(('youtube.com', 'youtu.be'), re.compile(r'youtube\.com/(?:c/|@|channel/|user/)([^/?]+)'), _load_scraper('youtube')),
+    'tiktok': PlatformSpec(('tiktok.com',), re.compile(r'tiktok\.com/@([^/?]+)'), _load_scraper('tiktok')),
+}
+SUPPORTED_PLATFORMS = tuple(PLATFORMS)
+
+# Registered domain -> platform (www., m., mobile., vm. resolve by stripping the first label)
+_HOST_TO_PLATFORM = {host: platform for platform, spec in PLATFORMS.items() for host in spec.hosts}
+
+@lru_cache(maxsize=4096)
 def detect_platform(url: str) -> str:
     """Detect social media platform from URL"""
-    url_lower = url.lower()
-    
-    if 'instagram.com' in url_lower:
-        return 'instagram'
-    elif 'linkedin.com' in url_lower:
-        return 'linkedin'
-    elif 'twitter.com' in url_lower or 'x.com' in url_lower:
-        return 'twitter'
-    elif 'youtube.com' in url_lower or 'youtu.be' in url_lower:
-        return 'youtube'
-    elif 'tiktok.com' in url_lower:
-        return 'tiktok'
-    else:
+    try:
+        # Parse once; accept scheme-less input such as "instagram.com/natgeo"
+        host = urlsplit(url if '//' in url else f'//{url}').hostname or ''
+    except ValueError:
         return 'unknown'
+    
+    platform = _HOST_TO_PLATFORM.get(host)
+    if platform is None:
+        platform = _HOST_TO_PLATFORM.get(host.partition('.')[2], 'unknown')
+    return platform
 
+@lru_cache(maxsize=4096)
 def extract_username(url: str, platform: str) -> str:
     """Extract username from social media URL"""
     try:
-        if platform == 'instagram':
-            match = re.search(r'instagram\.com/([^/?]+)', url)
-            return match.group(1) if match else ''
-        elif platform == 'linkedin':
-            match = re.search(r'linkedin\.com/(?:in|company)/([^/?]+)', url)
-            return match.group(1) if match else ''
-        elif platform == 'twitter':
-            match = re.search(r'(?:twitter|x)\.com/([^/?]+)', url)
-            return match.group(1) if match else ''
-        elif platform == 'youtube':
-            match = re.search(r'youtube\.com/(?:c/|@|channel/|user/)([^/?]+)', url)
-            return match.group(1) if match else ''
-        elif platform == 'tiktok':
-            match = re.search(r'tiktok\.com/@([^/?]+)', url)
-            return match.group(1) if match else ''
-        return ''
+        spec = PLATFORMS.get(platform)
+        if not spec:
+            return ''
+        match = spec.username_re.search(url)
+        return match.group(1) if match else ''
     except Exception as e:
         logger.error(f"Error extracting username from {url}: {str(e)}")
         return ''
 
-def update_scraper_url(scraper_path: str, platform: str, url: str) -> bool:
-    """Update the URL in a scraper file dynamically"""
-    try:
-        with open(scraper_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Platform-specific URL variable patterns
-        if platform == 'instagram':
-            pattern = r'instagram_url = "[^"]*"'
-            replacement = f'instagram_url = "{url}"'
-        elif platform == 'linkedin':
-            pattern = r'linkedin_url = "[^"]*"'
-            replacement = f'linkedin_url = "{url}"'
-        elif platform == 'twitter':
-            pattern = r'twitter_url = "[^"]*"'
-            replacement = f'twitter_url = "{url}"'
-        elif platform == 'youtube':
-            pattern = r'youtube_url = "[^"]*"'
-            replacement = f'youtube_url = "{url}"'
-        elif platform == 'tiktok':
-            pattern = r'tiktok_url = "[^"]*"'
-            replacement = f'tiktok_url = "{url}"'
-        else:
-            return False
-        
-        # Update the content
-        updated_content = re.sub(pattern, replacement, content)
-        
-        # Write back to file
-        with open(scraper_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
-        
-        return True
-    except Exception as e:
-        logger.error(f"Error updating scraper {scraper_path}: {str(e)}")
-        return False
+# Downstream stages, imported once and run in-process like the scrapers
+retrieve = importlib.import_module(f"{_PACKAGE_PREFIX}retrieve")
+results = importlib.import_module(f"{_PACKAGE_PREFIX}results")
+
+# Held while a pipeline runs retrieve.py -> results.py -> result.json load,
+# since every task writes and reads the same fixed files
+_pipeline_files_lock = asyncio.Lock()
+
+# Upper bound on a single scraper run (seconds). Scrapers get it as a deadline
+# and abort their own actor runs there, since a timed-out thread can't be killed;
+# the grace period lets them return before they are given up on
+SCRAPER_TIMEOUT = 300
+SCRAPER_TIMEOUT_GRACE = 30
 
-def run_scraper(platform: str) -> bool:
-    """Execute a specific platform scraper"""
+# Scrapers block on Apify for minutes at a time, so they get their own pool
+# rather than tying up the default executor used for file I/O
+SCRAPER_WORKERS = int(os.getenv('SCRAPER_WORKERS', '8'))
+scraper_executor = ThreadPoolExecutor(max_workers=SCRAPER_WORKERS, thread_name_prefix='scraper')
+
+def run_scraper(platform: str, url: str, deadline: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+    """Execute a specific platform scraper for one URL and return the scraped items
+    
+    Args:
+        platform: Platform whose scraper to run
+        url: Profile URL to scrape
+        deadline: time.monotonic() value at which the scraper's actor runs are aborted
+    """
     try:
-        scrapers_dir = Path(__file__).parent / 'scrapers'
-        scraper_file = scrapers_dir / f'{platform}.py'
-        
-        if not scraper_file.exists():
-            logger.error(f"Scraper file not found: {scraper_file}")
-            return False
-        
-        # Run the scraper with proper encoding handling
-        result = subprocess.run(
-            [sys.executable, str(scraper_file)],
-            cwd=str(scrapers_dir),
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore',  # Ignore encoding errors
-            timeout=300  # 5-minute timeout
-        )
+        spec = PLATFORMS.get(platform)
+        if not spec:
+            logger.error(f"Scraper not found for platform: {platform}")
+            return None
         
-        if result.returncode == 0:
-            logger.info(f"Successfully executed {platform} scraper")
-            logger.info(f"Scraper output: {result.stdout}")
-            return True
-        else:
-            logger.error(f"Error running {platform} scraper: {result.stderr}")
-            return False
+        items = spec.scraper.run(url, deadline=deadline)
+        logger.info(f"Successfully executed {platform} scraper ({len(items)} items)")
+        return items
             
-    except subprocess.TimeoutExpired:
-        logger.error(f"Timeout running {platform} scraper")
-        return False
     except Exception as e:
         logger.error(f"Exception running {platform} scraper: {str(e)}")
-        return False
+        return None
 
-def run_retrieve_process() -> bool:
-    """Execute retrieve.py to process scraped data"""
+def run_retrieve_process(items: List[Dict[str, Any]]) -> bool:
+    """Execute retrieve.py to process the scraped items"""
     try:
-        retrieve_file = Path(__file__).parent / 'retrieve.py'
-        
-        result = subprocess.run(
-            [sys.executable, str(retrieve_file)],
-            cwd=str(Path(__file__).parent),
-            capture_output=True,
-            text=True,
-            timeout=120  # 2-minute timeout
-        )
-        
-        if result.returncode == 0:
-            logger.info("Successfully executed retrieve.py")
-            logger.info(f"Retrieve output: {result.stdout}")
-            return True
-        else:
-            logger.error(f"Error running retrieve.py: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout running retrieve.py")
-        return False
+        retrieve.main(items)
+        logger.info("Successfully executed retrieve.py")
+        return True
     except Exception as e:
         logger.error(f"Exception running retrieve.py: {str(e)}")
         return False
@@ -249,27 +325,9 @@ def run_retrieve_process() -> bool:
 def run_results_process() -> bool:
     """Execute results.py to select and score content"""
     try:
-        results_file = Path(__file__).parent / 'results.py'
-        
-        result = subprocess.run(
-            [sys.executable, str(results_file)],
-            cwd=str(Path(__file__).parent),
-            capture_output=True,
-            text=True,
-            timeout=60  # 1-minute timeout
-        )
-        
-        if result.returncode == 0:
-            logger.info("Successfully executed results.py")
-            logger.info(f"Results output: {result.stdout}")
-            return True
-        else:
-            logger.error(f"Error running results.py: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error("Timeout running results.py")
-        return False
+        results.generate_results()
+        logger.info("Successfully executed results.py")
+        return True
     except Exception as e:
         logger.error(f"Exception running results.py: {str(e)}")
         return False
@@ -279,8 +337,7 @@ def load_result_json() -> Optional[List[Dict[str, Any]]]:
     try:
         result_file = Path(__file__).parent / 'result.json'
         if result_file.exists():
-            with open(result_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return results.load_json_file(result_file)
         else:
             logger.error("result.json file not found")
             return None
@@ -302,7 +359,14 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "url_caches": {
+            "detect_platform": detect_platform.cache_info()._asdict(),
+            "extract_username": extract_username.cache_info()._asdict()
+        }
+    }
 
 @app.post("/process-content")
 async def process_content(request: ContentRequest, background_tasks: BackgroundTasks):
@@ -333,8 +397,8 @@ async def process_content(request: ContentRequest, background_tasks: BackgroundT
             url_analysis.append(analysis)
             logger.info(f"URL {i+1}: {platform} - @{username} ({url})")
         
-        # Initialize task status with file persistence
-        processing_tasks[task_id] = {
+        # Initialize task status with persistence
+        cache_task(task_id, {
             "status": "processing",
             "started_at": datetime.now().isoformat(),
             "urls_processed": url_analysis,
@@ -343,10 +407,11 @@ async def process_content(request: ContentRequest, background_tasks: BackgroundT
             "result_data": None,
             "error": None,
             "completed_at": None
-        }
+        })
+        _task_finished[task_id] = asyncio.Event()
         
-        # Save to file for persistence
-        save_task_to_file(task_id, processing_tasks[task_id])
+        # Save to the task store for persistence
+        queue_task_save(task_id)
         
         # Start background processing
         background_tasks.add_task(process_pipeline, task_id, request.urls, url_analysis)
@@ -366,21 +431,43 @@ async def process_content(request: ContentRequest, background_tasks: BackgroundT
         logger.error(f"Error in process_content: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def task_etag(task_data: Dict[str, Any]) -> str:
+    """ETag of a task's /results payload, which only changes when the task finishes"""
+    return f'"{task_data["status"]}-{task_data.get("completed_at") or ""}"'
+
 @app.get("/results/{task_id}")
-async def get_results(task_id: str):
-    """Get the results of a processing task"""
+async def get_results(task_id: str, request: Request, response: Response, wait: float = Query(0, ge=0, le=MAX_RESULT_WAIT)):
+    """Get the results of a processing task
+    
+    With wait > 0 a still-processing task is held open for up to that many
+    seconds and answered as soon as it finishes (long-poll). A request whose
+    If-None-Match matches the current ETag gets an empty 304 instead
+    """
     # Try to get from memory first
     task_data = processing_tasks.get(task_id)
     
-    # If not in memory, try to load from file
+    # If not in memory, try to load from the task store
     if not task_data:
-        task_data = load_task_from_file(task_id)
+        task_data = await asyncio.to_thread(load_task, task_id)
         if task_data:
-            processing_tasks[task_id] = task_data  # Cache in memory
+            cache_task(task_id, task_data)  # Cache in memory
     
     if not task_data:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    # Only tasks running in this process can be waited on
+    finished = _task_finished.get(task_id)
+    if wait and finished is not None and task_data["status"] == "processing":
+        try:
+            await asyncio.wait_for(finished.wait(), timeout=wait)
+        except asyncio.TimeoutError:
+            pass
+    
+    etag = task_etag(task_data)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    
     logger.info(f"Retrieved results for task: {task_id}")
     
     return {
@@ -405,6 +492,28 @@ def get_status_message(status: str) -> str:
     return messages.get(status, "Unknown status")
 
 # Background Processing Functions
+async def scrape_url(platform: str, url: str) -> Optional[List[Dict[str, Any]]]:
+    """Run one URL's scraper off the event loop; returns None if it failed or timed out"""
+    try:
+        logger.info(f"Processing {platform} with URL: {url}")
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + SCRAPER_TIMEOUT
+        items = await asyncio.wait_for(
+            loop.run_in_executor(scraper_executor, run_scraper, platform, url, deadline),
+            timeout=SCRAPER_TIMEOUT + SCRAPER_TIMEOUT_GRACE,
+        )
+        if items is not None:
+            logger.info(f"Successfully completed {platform} scraping for {url}")
+        else:
+            logger.error(f"Failed to run {platform} scraper for {url}")
+        return items
+    except asyncio.TimeoutError:
+        logger.error(f"Timeout running {platform} scraper for {url}")
+        return None
+    except Exception as e:
+        logger.error(f"Error processing {platform} with {url}: {str(e)}")
+        return None
+
 async def process_pipeline(task_id: str, urls: List[str], url_analysis: List[Dict]):
     """Complete pipeline processing: scrapers → retrieve.py → results.py"""
     try:
@@ -427,78 +536,51 @@ async def process_pipeline(task_id: str, urls: List[str], url_analysis: List[Dic
         logger.info(f"Platforms to process: {list(platforms_to_run)}")
         logger.info(f"Platform URLs: {platform_urls}")
         
-        # Step 2: Initialize temp_data.json and process ALL URLs
-        temp_data_file = Path(__file__).parent / 'temp_data.json'
-        
-        # Clear temp_data.json at the start
-        with open(temp_data_file, 'w', encoding='utf-8') as f:
-            json.dump([], f)
-        logger.info("Initialized temp_data.json")
-        
-        scrapers_dir = Path(__file__).parent / 'scrapers'
+        # Step 2: Scrape ALL URLs and collect the items in memory for retrieve.py
+        temp_data = []
         successful_scrapers = []
         failed_scrapers = []
         
-        # Process each URL individually
-        for analysis in url_analysis:
-            platform = analysis['platform']
-            url = analysis['url']
-            
-            if platform == 'unknown':
-                continue
-                
-            try:
-                logger.info(f"Processing {platform} with URL: {url}")
-                
-                # Update scraper file with this specific URL
-                scraper_path = scrapers_dir / f'{platform}.py'
-                if update_scraper_url(str(scraper_path), platform, url):
-                    logger.info(f"Updated {platform} scraper with URL: {url}")
-                    
-                    # Run the scraper for this specific URL
-                    if run_scraper(platform):
-                        successful_scrapers.append(f"{platform}:{url}")
-                        logger.info(f"Successfully completed {platform} scraping for {url}")
-                    else:
-                        failed_scrapers.append(f"{platform}:{url}")
-                        logger.error(f"Failed to run {platform} scraper for {url}")
-                else:
-                    failed_scrapers.append(f"{platform}:{url}")
-                    logger.error(f"Failed to update {platform} scraper for {url}")
-                    
-            except Exception as e:
+        # Scrape all URLs concurrently; results come back in URL order
+        scrape_jobs = [(a['platform'], a['url']) for a in url_analysis if a['platform'] != 'unknown']
+        scraped = await asyncio.gather(*(scrape_url(platform, url) for platform, url in scrape_jobs))
+        
+        for (platform, url), items in zip(scrape_jobs, scraped):
+            if items is not None:
+                temp_data.extend(items)
+                successful_scrapers.append(f"{platform}:{url}")
+            else:
                 failed_scrapers.append(f"{platform}:{url}")
-                logger.error(f"Error processing {platform} with {url}: {str(e)}")
         
-        # Check if temp_data.json has any data
-        with open(temp_data_file, 'r', encoding='utf-8') as f:
-            temp_data = json.load(f)
-            
+        # Check if any data was scraped
         if not temp_data:
             raise Exception("No data was scraped from any URLs")
         
-        logger.info(f"Collected {len(temp_data)} total items in temp_data.json")
+        logger.info(f"Collected {len(temp_data)} total items")
         logger.info(f"Successful scrapers: {successful_scrapers}")
         logger.info(f"Failed scrapers: {failed_scrapers}")
         
-        # Step 3: Run retrieve.py to process and unify scraped data
-        logger.info("Starting data processing with retrieve.py...")
-        if not run_retrieve_process():
-            raise Exception("Failed to run retrieve.py data processing")
-        
-        logger.info("Data processing completed successfully")
-        
-        # Step 4: Run results.py to select and score content
-        logger.info("Starting content selection with results.py...")
-        if not run_results_process():
-            raise Exception("Failed to run results.py content selection")
-        
-        logger.info("Content selection completed successfully")
-        
-        # Step 5: Load the final result.json
-        result_data = load_result_json()
-        if result_data is None:
-            raise Exception("Failed to load final results from result.json")
+        # Steps 3-5 go through the shared data.json/result.json files, so they
+        # run for one task at a time; otherwise a task could read another's files
+        async with _pipeline_files_lock:
+            # Step 3: Run retrieve.py to process and unify scraped data
+            logger.info("Starting data processing with retrieve.py...")
+            if not await asyncio.to_thread(run_retrieve_process, temp_data):
+                raise Exception("Failed to run retrieve.py data processing")
+            
+            logger.info("Data processing completed successfully")
+            
+            # Step 4: Run results.py to select and score content
+            logger.info("Starting content selection with results.py...")
+            if not await asyncio.to_thread(run_results_process):
+                raise Exception("Failed to run results.py content selection")
+            
+            logger.info("Content selection completed successfully")
+            
+            # Step 5: Load the final result.json
+            result_data = await asyncio.to_thread(load_result_json)
+            if result_data is None:
+                raise Exception("Failed to load final results from result.json")
         
         # Update task with completed results
         processing_tasks[task_id].update({
@@ -509,8 +591,8 @@ async def process_pipeline(task_id: str, urls: List[str], url_analysis: List[Dic
             "failed_scrapers": failed_scrapers
         })
         
-        # Save to file for persistence
-        save_task_to_file(task_id, processing_tasks[task_id])
+        # Save to the task store for persistence
+        queue_task_save(task_id)
         
         logger.info(f"Pipeline processing completed successfully for task {task_id}")
         logger.info(f"Final result contains {len(result_data)} selected content items")
@@ -523,8 +605,14 @@ async def process_pipeline(task_id: str, urls: List[str], url_analysis: List[Dic
             "completed_at": datetime.now().isoformat()
         })
         
-        # Save to file for persistence
-        save_task_to_file(task_id, processing_tasks[task_id])
+        # Save to the task store for persistence
+        queue_task_save(task_id)
+    
+    finally:
+        # Wake any long-polling /results requests for this task
+        finished = _task_finished.pop(task_id, None)
+        if finished is not None:
+            finished.set()
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,7 +1,32 @@
-import json
+import mmap
 import os
+import orjson
 from collections import defaultdict
+import heapq
 import math
+from operator import itemgetter
+
+# Files above this size are parsed straight from an mmap instead of being
+# read into a bytes copy first; below it the mapping setup costs more than it saves
+MMAP_MIN_SIZE = 256 * 1024
+
+def load_json_file(path):
+    """Parse a JSON file, mapping it into memory when it is large
+    
+    Files read this way must only ever be replaced (os.replace), never
+    rewritten in place: truncating a mapped file crashes the reader (SIGBUS)
+    
+    Args:
+        path: Path of the JSON file to load
+    
+    Returns:
+        The parsed JSON value
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= MMAP_MIN_SIZE:
+            return orjson.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return orjson.loads(memoryview(mm))
 
 def load_data():
     """Load data from data.json"""
@@ -9,15 +34,36 @@ def load_data():
     data_file = os.path.join(scrape_dir, "data.json")
     
     try:
-        with open(data_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return load_json_file(data_file)
     except FileNotFoundError:
         print(f"Warning: {data_file} not found")
         return []
 
+# Platform -> (stats field, weight) pairs summed into the engagement score
+#   Twitter: Likes * 2 + Retweets * 3 + Replies * 1.5, plus Views * 0.3
+#            (retweets weighted highest as they show viral potential)
+#   LinkedIn: Comments * 5 + Likes * 1 (comments are more valuable on LinkedIn)
+#   YouTube/TikTok/Instagram: views only, with platform-specific multipliers
+#            (YouTube views run highest, Instagram's lowest)
+SCORE_WEIGHTS = {
+    'twitter': (('likes', 2), ('retweets', 3), ('replies', 1.5), ('views', 0.3)),
+    'linkedin': (('comments', 5), ('likes', 1)),
+    'youtube': (('views', 0.1),),
+    'tiktok': (('views', 0.2),),
+    'instagram': (('views', 0.5),),
+}
+
+# C-level field accessors for the per-item scoring/grouping loops
+_get_platform = itemgetter('platform')
+_get_url_group = itemgetter('URL_GROUP')
+_by_score = itemgetter(0)  # (score, index) entries in select_top_content
+
 def calculate_score(item):
     """Calculate engagement score for each platform"""
-    platform = item.get('platform', '').lower()
+    platform = _get_platform(item).lower() if 'platform' in item else ''
+    weights = SCORE_WEIGHTS.get(platform)
+    if weights is None:
+        return 0
     
     # For Twitter threads, use combined_stats; for regular posts, use stats
     if platform == 'twitter' and item.get('content_type') == 'thread':
@@ -25,87 +71,48 @@ def calculate_score(item):
     else:
         stats = item.get('stats', {})
     
-    if platform == 'twitter':
-        # Twitter: Views + Engagement (likes + retweets + replies)
-        views = safe_int(stats.get('views', 0))
-        likes = safe_int(stats.get('likes', 0))
-        retweets = safe_int(stats.get('retweets', 0))
-        replies = safe_int(stats.get('replies', 0))
-        
-        # Formula: Views * 0.3 + (Likes * 2 + Retweets * 3 + Replies * 1.5)
-        # Retweets weighted highest as they show viral potential
-        engagement_score = (likes * 2) + (retweets * 3) + (replies * 1.5)
-        total_score = (views * 0.3) + engagement_score
-        
-    elif platform == 'linkedin':
-        # LinkedIn: Comments and Likes (comments weighted higher)
-        comments = safe_int(stats.get('comments', 0))
-        likes = safe_int(stats.get('likes', 0))
-        
-        # Formula: Comments * 5 + Likes * 1 (comments are more valuable on LinkedIn)
-        total_score = (comments * 5) + likes
-        
-    elif platform in ['youtube', 'tiktok', 'instagram']:
-        # YouTube, TikTok, Instagram: Views only
-        views = safe_int(stats.get('views', 0))
-        
-        # Formula: Views with platform-specific multipliers
-        if platform == 'youtube':
-            # YouTube views are generally higher, so lower multiplier
-            total_score = views * 0.1
-        elif platform == 'tiktok':
-            # TikTok views can be very high, moderate multiplier
-            total_score = views * 0.2
-        else:  # instagram
-            # Instagram views are typically lower, higher multiplier
-            total_score = views * 0.5
-    else:
-        total_score = 0
+    total_score = 0
+    for field, weight in weights:
+        total_score += safe_int(stats.get(field, 0)) * weight
     
     return max(total_score, 0)  # Ensure non-negative score
 
 def safe_int(value):
     """Safely convert value to int, return 0 if conversion fails"""
-    try:
-        if value is None:
-            return 0
-        if isinstance(value, str) and value.isdigit():
-            return int(value)
-        elif isinstance(value, (int, float)):
-            return int(value)
-        else:
-            return 0
-    except (ValueError, TypeError):
-        return 0
+    # Dispatch on the exact type so the common cases never raise; stats are
+    # almost always ints straight from the scraper JSON
+    kind = type(value)
+    if kind is int:
+        return value
+    if kind is float:
+        return int(value) if value == value else 0  # NaN -> 0
+    if kind is str:
+        return int(value) if value.isdecimal() else 0
+    if kind is bool:
+        return int(value)
+    return 0
 
 def get_url_group(item):
     """Extract URL_GROUP for grouping"""
-    return item.get('URL_GROUP', '')
+    return _get_url_group(item) if 'URL_GROUP' in item else ''
 
 def select_top_content(data, target_total=9):  # Back to 9 as per specifications
     """Select top content ensuring even distribution across unique URL_GROUPs"""
     if not data:
         return []
     
-    # Group content by URL_GROUP
+    # Group content by URL_GROUP as (score, index into data) pairs; only the
+    # items that end up selected are copied, at the very end
     url_group_groups = defaultdict(list)
     
-    for item in data:
+    for idx, item in enumerate(data):
         url_group = get_url_group(item)
         if url_group:  # Only include items with valid URL_GROUP
-            # Calculate score and add to item
-            score = calculate_score(item)
-            item_with_score = item.copy()
-            item_with_score['engagement_score'] = score
-            url_group_groups[url_group].append(item_with_score)
+            url_group_groups[url_group].append((calculate_score(item), idx))
     
     if not url_group_groups:
         return []
     
-    # Sort each URL_GROUP's content by score (highest first)
-    for url_group in url_group_groups:
-        url_group_groups[url_group].sort(key=lambda x: x['engagement_score'], reverse=True)
-    
     unique_url_groups = len(url_group_groups)
     total_available_posts = sum(len(posts) for posts in url_group_groups.values())
     
@@ -121,25 +128,27 @@ def select_top_content(data, target_total=9):  # Back to 9 as per specifications
     
     # If we can't make exactly 9, prioritize multiples of 3
     if actual_target < target_total:
-        # Find the largest multiple of 3 that's <= actual_target
-        multiples_of_3 = [9, 6, 3]
-        for multiple in multiples_of_3:
-            if multiple <= actual_target:
-                actual_target = multiple
-                print(f"Adjusted target to {actual_target} (multiple of 3)")
-                break
+        if actual_target >= 3:
+            # Round down to the largest multiple of 3 that's <= actual_target
+            actual_target -= actual_target % 3
+            print(f"Adjusted target to {actual_target} (multiple of 3)")
         else:
             # If can't even make 3, just use what we have
             print(f"Using all available content: {actual_target} posts")
     
     # Calculate distribution
-    base_posts_per_url_group = actual_target // unique_url_groups
-    extra_posts = actual_target % unique_url_groups
+    base_posts_per_url_group, extra_posts = divmod(actual_target, unique_url_groups)
     
     print(f"Target distribution: {base_posts_per_url_group} posts per URL group")
     if extra_posts > 0:
         print(f"{extra_posts} URL groups will get 1 extra post")
     
+    # Only the top base + extra posts of a group can ever be selected, so keep
+    # just those (highest first, ties in scrape order) instead of sorting it all
+    posts_per_group_needed = base_posts_per_url_group + extra_posts
+    for url_group in url_group_groups:
+        url_group_groups[url_group] = heapq.nlargest(posts_per_group_needed, url_group_groups[url_group], key=_by_score)
+    
     # Select content
     selected_content = []
     url_groups = list(url_group_groups.keys())
@@ -157,26 +166,19 @@ def select_top_content(data, target_total=9):  # Back to 9 as per specifications
     for url_group in url_groups:
         available_content = url_group_groups[url_group]
         if len(available_content) > base_posts_per_url_group:
-            # Add remaining content with URL group identifier
-            for i in range(base_posts_per_url_group, len(available_content)):
-                content_item = available_content[i].copy()
-                content_item['source_url_group'] = url_group
-                remaining_content.append(content_item)
+            remaining_content.extend(available_content[base_posts_per_url_group:])
     
-    # Sort remaining content by score and take the best ones
-    remaining_content.sort(key=lambda x: x['engagement_score'], reverse=True)
+    # Take the best of the remaining content by score
+    remaining_content = heapq.nlargest(extra_posts, remaining_content, key=_by_score)
     
     # Add extra posts until we reach the target
-    for i in range(min(extra_posts, len(remaining_content))):
-        content_item = remaining_content[i]
-        # Remove the temporary field
-        del content_item['source_url_group']
-        selected_content.append(content_item)
+    selected_content.extend(remaining_content)
     
     # Sort final selection by score (highest first)
-    selected_content.sort(key=lambda x: x['engagement_score'], reverse=True)
+    selected_content.sort(key=_by_score, reverse=True)
     
-    return selected_content[:actual_target]  # Ensure we don't exceed target
+    # Ensure we don't exceed target
+    return [data[idx] | {'engagement_score': score} for score, idx in selected_content[:actual_target]]
 
 def generate_results():
     """Main function to generate results.json"""
@@ -217,8 +219,12 @@ def generate_results():
     scrape_dir = os.path.dirname(__file__)
     results_file = os.path.join(scrape_dir, "result.json")
     
-    with open(results_file, "w", encoding="utf-8") as f:
-        json.dump(selected_content, f, indent=2, ensure_ascii=False)
+    # orjson writes raw UTF-8 (the ensure_ascii=False equivalent) by default.
+    # Swapped in from a temp file so a reader mapping the old file never sees it truncated
+    tmp_file = results_file + ".tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(selected_content, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    os.replace(tmp_file, results_file)
     
     # Print summary
     print(f"\nContent selection completed!")
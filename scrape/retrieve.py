@@ -1,8 +1,43 @@
-import json
+import logging
 import os
+import re
+import orjson
+from operator import add
+
+logger = logging.getLogger(__name__)
+
+# File locations, resolved once at import
+SCRAPE_DIR = os.path.dirname(__file__)  # This is the scrape folder
+SCRAPERS_DIR = os.path.join(SCRAPE_DIR, "scrapers")
+TWITTER_FILE = os.path.join(SCRAPERS_DIR, "twitter_data.json")
+YOUTUBE_FILE = os.path.join(SCRAPERS_DIR, "youtube_data.json")
+TEMP_FILE = os.path.join(SCRAPE_DIR, "temp_data.ndjson")
+OUTPUT_FILE = os.path.join(SCRAPE_DIR, "data.json")
+
+# data.json write buffer: records (often larger than the default 8 KiB buffer)
+# are coalesced into few large writes instead of one or two syscalls each
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Separator between per-item progress lines
+SEP = "-" * 50
+
+# Thread tweet stats fields and the tweet fields they are read from
+TWEET_STAT_FIELDS = ('views', 'likes', 'retweets', 'replies', 'quotes', 'bookmarks')
+TWEET_STAT_SOURCES = ('view_count', 'favorite_count', 'retweet_count', 'reply_count', 'quote_count', 'bookmark_count')
+
+# A whitespace-delimited word starting with '#', captured without its
+# leading/trailing '#'s (same result as split() + startswith('#') + strip('#'))
+_HASHTAG_RE = re.compile(r'(?<!\S)#+(\S*?)#*(?!\S)')
+
+# ISO-8601 video duration as YouTube reports it (PT1H2M30S, PT1M30S, PT45S)
+_DURATION_RE = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
 
 def extract_instagram_fields(item):
     """Extract fields from Instagram data with comprehensive stats and media"""
+    # Only videos (reels) are kept; other Instagram posts are skipped
+    if item.get("type") != "Video":
+        return None
+    
     # Determine post type based on content
     post_type = item.get('type', 'unknown').lower()
     if post_type not in ['video', 'image', 'carousel']:
@@ -13,10 +48,10 @@ def extract_instagram_fields(item):
     image_urls = []
     
     # Handle image URLs (Instagram may have multiple images in carousels)
-    if item.get('imageUrl'):
-        image_urls.append(item.get('imageUrl'))
-    elif item.get('images'):
-        image_urls.extend(item.get('images', []))
+    if (image_url := item.get('imageUrl')):
+        image_urls.append(image_url)
+    elif (images := item.get('images')):
+        image_urls.extend(images)
     
     # Extract comprehensive stats
     stats = {
@@ -30,9 +65,12 @@ def extract_instagram_fields(item):
     hashtags = item.get('hashtags', [])
     if isinstance(hashtags, str):
         # If hashtags is a string, extract them
-        hashtags = [tag.strip('#') for tag in hashtags.split() if tag.startswith('#')]
+        hashtags = _HASHTAG_RE.findall(hashtags)
     
-    # Build result with only essential fields
+    username = item.get('ownerUsername')
+    
+    # Build result with only essential fields; optional fields are None (or
+    # empty) when missing and dropped by clean_data
     result = {
         "platform": "instagram",
         "content_type": "post",
@@ -45,19 +83,14 @@ def extract_instagram_fields(item):
         "stats": stats,
         "hashtags": hashtags,
         "author": {
-            "username": item.get('ownerUsername')
+            "username": username,
+            "name": item.get('ownerFullName') or None,
+            "profile_url": f"https://instagram.com/{username}" if username else None
         },
-        "URL_GROUP": item.get('URL_GROUP')  # Preserve URL_GROUP from scraper
+        "URL_GROUP": item.get('URL_GROUP'),  # Preserve URL_GROUP from scraper
+        "id": item.get('id') or None
     }
     
-    # Add optional fields only if they exist
-    if item.get('id'):
-        result["id"] = item.get('id')
-    if item.get('ownerFullName'):
-        result["author"]["name"] = item.get('ownerFullName')
-    if item.get('ownerUsername'):
-        result["author"]["profile_url"] = f"https://instagram.com/{item.get('ownerUsername')}"
-    
     # Remove None/null values and empty fields
     return clean_data(result)
 
@@ -76,8 +109,8 @@ def extract_tiktok_fields(item):
     
     # Extract hashtags
     hashtags = []
-    if item.get('hashtags'):
-        for tag in item.get('hashtags', []):
+    if (tags := item.get('hashtags')):
+        for tag in tags:
             if isinstance(tag, dict) and tag.get('name'):
                 hashtags.append(tag['name'])
             elif isinstance(tag, str):
@@ -86,36 +119,32 @@ def extract_tiktok_fields(item):
     # Extract video URL
     video_url = item.get('webVideoUrl') or item.get('videoUrl')
     
-    # Build result with only essential fields
+    followers = safe_int(author_meta.get('fans', 0))
+    
+    # Build result with only essential fields; optional fields are None (or
+    # empty) when missing and dropped by clean_data
     result = {
         "platform": "tiktok",
         "content_type": "video",
         "type": "video",
-        "url": item.get('webVideoUrl') or item.get('videoUrl'),
+        "url": video_url,
         "text": item.get('text', ''),
         "video_url": video_url,
         "image_urls": [],  # TikTok is video-only
         "media_count": 1 if video_url else 0,
         "stats": stats,
         "hashtags": hashtags,
-        "author": {},
-        "URL_GROUP": item.get('URL_GROUP')  # Preserve URL_GROUP from scraper
+        "author": {
+            "name": author_meta.get('nickName') or None,
+            "username": author_meta.get('name') or None,
+            "profile_url": author_meta.get('profileUrl') or None,
+            "followers_count": followers if followers > 0 else None
+        },
+        "URL_GROUP": item.get('URL_GROUP'),  # Preserve URL_GROUP from scraper
+        "id": item.get('id') or None,
+        "duration": item.get('videoDuration') or None
     }
     
-    # Add optional fields only if they exist
-    if item.get('id'):
-        result["id"] = item.get('id')
-    if author_meta.get('nickName'):
-        result["author"]["name"] = author_meta.get('nickName')
-    if author_meta.get('name'):
-        result["author"]["username"] = author_meta.get('name')
-    if author_meta.get('profileUrl'):
-        result["author"]["profile_url"] = author_meta.get('profileUrl')
-    if safe_int(author_meta.get('fans', 0)) > 0:
-        result["author"]["followers_count"] = safe_int(author_meta.get('fans', 0))
-    if item.get('videoDuration'):
-        result["duration"] = item.get('videoDuration')
-    
     # Remove None/null values and empty fields
     return clean_data(result)
 
@@ -154,12 +183,10 @@ def extract_linkedin_fields(item):
     
     # Extract hashtags from text
     text = item.get('text', '')
-    hashtags = []
-    if text:
-        words = text.split()
-        hashtags = [word.strip('#') for word in words if word.startswith('#')]
+    hashtags = _HASHTAG_RE.findall(text) if text else []
     
-    # Build result with only essential fields
+    # Build result with only essential fields; optional fields are None (or
+    # empty) when missing and dropped by clean_data
     result = {
         "platform": "linkedin",
         "content_type": "post",
@@ -171,44 +198,44 @@ def extract_linkedin_fields(item):
         "media_count": (1 if video_url else 0) + len(image_urls),
         "stats": stats,
         "hashtags": hashtags,
-        "author": {},
-        "URL_GROUP": item.get('URL_GROUP')  # Preserve URL_GROUP from scraper
+        "author": {
+            "name": f"{author.get('firstName', '')} {author.get('lastName', '')}".strip(),
+            "username": author.get('publicId') or None,
+            "headline": author.get('occupation') or None,
+            "profile_url": author.get('profileUrl') or item.get('authorProfileUrl') or None
+        },
+        "URL_GROUP": item.get('URL_GROUP'),  # Preserve URL_GROUP from scraper
+        "id": item.get('urn') or None,
+        "activity_description": item.get('activityDescription') or None
     }
     
-    # Add optional fields only if they exist
-    if item.get('urn'):
-        result["id"] = item.get('urn')
-    if item.get('activityDescription'):
-        result["activity_description"] = item.get('activityDescription')
-    
-    # Add author fields only if they exist
-    author_name = f"{author.get('firstName', '')} {author.get('lastName', '')}".strip()
-    if author_name:
-        result["author"]["name"] = author_name
-    if author.get('publicId'):
-        result["author"]["username"] = author.get('publicId')
-    if author.get('occupation'):
-        result["author"]["headline"] = author.get('occupation')
-    if author.get('profileUrl') or item.get('authorProfileUrl'):
-        result["author"]["profile_url"] = author.get('profileUrl') or item.get('authorProfileUrl')
-    
     # Remove None/null values and empty fields
     return clean_data(result)
 
 def load_twitter_data():
     """Load Twitter data from twitter_data.json"""
-    scrapers_dir = os.path.join(os.path.dirname(__file__), "scrapers")
-    twitter_file = os.path.join(scrapers_dir, "twitter_data.json")
-    
     try:
-        with open(twitter_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(TWITTER_FILE, "rb") as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
-        print(f"Warning: {twitter_file} not found")
+        print(f"Warning: {TWITTER_FILE} not found")
         return []
 
 
 
+def tweet_author(user, profile_url):
+    """Build the author block shared by tweets and threads; missing fields are None"""
+    followers = safe_int(user.get('followers_count', 0))
+    return {
+        "username": user.get('screen_name'),
+        "name": user.get('name') or None,
+        "description": user.get('description') or None,
+        "followers_count": followers if followers > 0 else None,
+        "profile_url": profile_url or None,
+        "location": user.get('location') or None,
+        "profile_image_url": user.get('profile_image_url') or None
+    }
+
 def extract_twitter_fields(item):
     """Extract fields from Twitter data with enhanced thread and tweet support"""
     content_type = item.get('content_type', 'tweet')
@@ -228,9 +255,10 @@ def extract_twitter_fields(item):
 def extract_single_tweet(item):
     """Extract data from a single tweet"""
     user = item.get('user', {})
+    media = item.get('media', [])
     
     # Determine post type and extract media
-    post_type, video_url, image_urls = determine_post_type_and_media(item.get('media', []))
+    post_type, video_url, image_urls = determine_post_type_and_media(media)
     
     # Extract engagement stats
     stats = {
@@ -250,7 +278,8 @@ def extract_single_tweet(item):
     tweet_url = item.get('tweet_url', '')
     profile_url = extract_profile_url_from_tweet(tweet_url, user.get('screen_name'))
     
-    # Build result with only essential fields
+    # Build result with only essential fields; optional fields are None (or
+    # empty) when missing and dropped by clean_data
     result = {
         "platform": "twitter",
         "content_type": "tweet",
@@ -259,36 +288,17 @@ def extract_single_tweet(item):
         "text": text,
         "video_url": video_url,
         "image_urls": image_urls,
-        "media_count": len(item.get('media', [])),
+        "media_count": len(media),
         "stats": stats,
         "hashtags": hashtags,
         "urls": extract_urls(item),
-        "author": {
-            "username": user.get('screen_name')
-        },
-        "URL_GROUP": item.get('URL_GROUP')  # Preserve URL_GROUP from scraper
+        "author": tweet_author(user, profile_url),
+        "URL_GROUP": item.get('URL_GROUP'),  # Preserve URL_GROUP from scraper
+        "id": item.get('id') or None,
+        "timestamp": item.get('created_at_datetime') or None,
+        "language": item.get('lang') or None
     }
     
-    # Add optional fields only if they exist
-    if item.get('id'):
-        result["id"] = item.get('id')
-    if user.get('name'):
-        result["author"]["name"] = user.get('name')
-    if user.get('description'):
-        result["author"]["description"] = user.get('description')
-    if safe_int(user.get('followers_count', 0)) > 0:
-        result["author"]["followers_count"] = safe_int(user.get('followers_count', 0))
-    if profile_url:
-        result["author"]["profile_url"] = profile_url
-    if user.get('location'):
-        result["author"]["location"] = user.get('location')
-    if user.get('profile_image_url'):
-        result["author"]["profile_image_url"] = user.get('profile_image_url')
-    if item.get('created_at_datetime'):
-        result["timestamp"] = item.get('created_at_datetime')
-    if item.get('lang'):
-        result["language"] = item.get('lang')
-    
     # Remove None/null values and empty fields
     return clean_data(result)
 
@@ -302,81 +312,63 @@ def extract_thread(item):
     
     # Process each tweet in the thread
     processed_tweets = []
-    combined_stats = {
-        'views': 0,
-        'likes': 0,
-        'retweets': 0,
-        'replies': 0,
-        'quotes': 0,
-        'bookmarks': 0
-    }
+    tweet_texts = []  # Joined into combined_text, collected in the same pass
+    # Running per-field totals, in TWEET_STAT_FIELDS order
+    combined_totals = [0] * len(TWEET_STAT_FIELDS)
     
-    all_media = {
-        'videos': [],
-        'images': [],
-        'total_count': 0
-    }
+    # Thread media as parallel (url, tweet number, tweet id) columns; the
+    # per-item dicts of all_media are only built once, for the result
+    video_urls, video_tweet_numbers, video_tweet_ids = [], [], []
+    thread_image_urls, image_tweet_numbers, image_tweet_ids = [], [], []
+    media_total = 0
     
     # Process each tweet in order
     for idx, tweet in enumerate(thread_tweets, 1):
-        user = tweet.get('user', {})
+        tweet_id = tweet.get('id')
+        media = tweet.get('media', [])
         
         # Determine post type and media for this tweet
-        post_type, video_url, image_urls = determine_post_type_and_media(tweet.get('media', []))
+        post_type, video_url, image_urls = determine_post_type_and_media(media)
         
         # Extract stats for this tweet
-        tweet_stats = {
-            'views': safe_int(tweet.get('view_count', 0)),
-            'likes': safe_int(tweet.get('favorite_count', 0)),
-            'retweets': safe_int(tweet.get('retweet_count', 0)),
-            'replies': safe_int(tweet.get('reply_count', 0)),
-            'quotes': safe_int(tweet.get('quote_count', 0)),
-            'bookmarks': safe_int(tweet.get('bookmark_count', 0))
-        }
+        tweet_values = [safe_int(tweet.get(source, 0)) for source in TWEET_STAT_SOURCES]
+        tweet_stats = dict(zip(TWEET_STAT_FIELDS, tweet_values))
         
-        # Add to combined stats
-        for key in combined_stats:
-            combined_stats[key] += tweet_stats[key]
+        # Add to combined stats (element-wise, in one C-level map)
+        combined_totals = list(map(add, combined_totals, tweet_values))
         
         # Collect media
         if video_url:
-            all_media['videos'].append({
-                'url': video_url,
-                'tweet_number': idx,
-                'tweet_id': tweet.get('id')
-            })
+            video_urls.append(video_url)
+            video_tweet_numbers.append(idx)
+            video_tweet_ids.append(tweet_id)
         
-        for img_url in image_urls:
-            all_media['images'].append({
-                'url': img_url,
-                'tweet_number': idx,
-                'tweet_id': tweet.get('id')
-            })
+        if image_urls:
+            thread_image_urls += image_urls
+            image_tweet_numbers += [idx] * len(image_urls)
+            image_tweet_ids += [tweet_id] * len(image_urls)
         
-        all_media['total_count'] += len(tweet.get('media', []))
+        media_total += len(media)
         
         # Process individual tweet
+        text = tweet.get('text', '') or tweet.get('full_text', '')
+        tweet_texts.append(text)
         tweet_data = {
             "tweet_number": idx,
-            "text": tweet.get('text', '') or tweet.get('full_text', ''),
+            "text": text,
             "type": post_type,
             "url": tweet.get('tweet_url'),
             "video_url": video_url,
             "image_urls": image_urls,
-            "media_count": len(tweet.get('media', [])),
+            "media_count": len(media),
             "stats": tweet_stats,
             "hashtags": tweet.get('hastags', []),
-            "urls": extract_urls(tweet)
+            "urls": extract_urls(tweet),
+            "id": tweet_id or None,
+            "timestamp": tweet.get('created_at_datetime') or None,
+            "language": tweet.get('lang') or None
         }
         
-        # Add optional fields only if they exist
-        if tweet.get('id'):
-            tweet_data["id"] = tweet.get('id')
-        if tweet.get('created_at_datetime'):
-            tweet_data["timestamp"] = tweet.get('created_at_datetime')
-        if tweet.get('lang'):
-            tweet_data["language"] = tweet.get('lang')
-        
         processed_tweets.append(tweet_data)
     
     # Get main thread info from first tweet
@@ -389,12 +381,13 @@ def extract_thread(item):
     
     # Determine overall thread type
     thread_type = "thread"
-    if all_media['videos']:
+    if video_urls:
         thread_type = "thread_with_videos"
-    elif all_media['images']:
+    elif thread_image_urls:
         thread_type = "thread_with_images"
     
-    # Build result with only essential fields
+    # Build result with only essential fields; optional fields are None (or
+    # empty) when missing and dropped by clean_data
     result = {
         "platform": "twitter",
         "content_type": "thread",
@@ -402,44 +395,32 @@ def extract_thread(item):
         "url": main_tweet_url,
         "thread_length": thread_length,
         "tweets": processed_tweets,  # Ordered list of tweets with tweet1, tweet2, etc.
-        "combined_text": " ".join([t['text'] for t in processed_tweets]),
-        "combined_stats": combined_stats,
-        "all_media": all_media,
-        "author": {
-            "username": main_user.get('screen_name')
+        "combined_text": " ".join(tweet_texts),
+        "combined_stats": dict(zip(TWEET_STAT_FIELDS, combined_totals)),
+        "all_media": {
+            'videos': [{'url': u, 'tweet_number': n, 'tweet_id': t}
+                       for u, n, t in zip(video_urls, video_tweet_numbers, video_tweet_ids)],
+            'images': [{'url': u, 'tweet_number': n, 'tweet_id': t}
+                       for u, n, t in zip(thread_image_urls, image_tweet_numbers, image_tweet_ids)],
+            'total_count': media_total
         },
-        "URL_GROUP": item.get('URL_GROUP')  # Preserve URL_GROUP from scraper
+        "author": tweet_author(main_user, profile_url),
+        "URL_GROUP": item.get('URL_GROUP'),  # Preserve URL_GROUP from scraper
+        "id": item.get('thread_id') or None,
+        "timestamp": main_tweet.get('created_at_datetime') or None,
+        "language": main_tweet.get('lang') or None
     }
     
-    # Add optional fields only if they exist
-    if item.get('thread_id'):
-        result["id"] = item.get('thread_id')
-    if main_user.get('name'):
-        result["author"]["name"] = main_user.get('name')
-    if main_user.get('description'):
-        result["author"]["description"] = main_user.get('description')
-    if safe_int(main_user.get('followers_count', 0)) > 0:
-        result["author"]["followers_count"] = safe_int(main_user.get('followers_count', 0))
-    if profile_url:
-        result["author"]["profile_url"] = profile_url
-    if main_user.get('location'):
-        result["author"]["location"] = main_user.get('location')
-    if main_user.get('profile_image_url'):
-        result["author"]["profile_image_url"] = main_user.get('profile_image_url')
-    if main_tweet.get('created_at_datetime'):
-        result["timestamp"] = main_tweet.get('created_at_datetime')
-    if main_tweet.get('lang'):
-        result["language"] = main_tweet.get('lang')
-    
     # Remove None/null values and empty fields
     return clean_data(result)
 
 def extract_legacy_tweet(item):
     """Extract data from legacy Twitter format (fallback)"""
     user = item.get('user', {})
+    media = item.get('media', [])
     
     # Determine post type and extract media
-    post_type, video_url, image_urls = determine_post_type_and_media(item.get('media', []))
+    post_type, video_url, image_urls = determine_post_type_and_media(media)
     
     # Extract engagement stats
     stats = {
@@ -459,7 +440,8 @@ def extract_legacy_tweet(item):
     text = item.get('text', '') or item.get('full_text', '')
     hashtags = item.get('hastags', [])  # Note: API uses 'hastags' (typo)
     
-    # Build result with only essential fields
+    # Build result with only essential fields; optional fields are None (or
+    # empty) when missing and dropped by clean_data
     result = {
         "platform": "twitter",
         "content_type": "tweet",
@@ -468,36 +450,17 @@ def extract_legacy_tweet(item):
         "text": text,
         "video_url": video_url,
         "image_urls": image_urls,
-        "media_count": len(item.get('media', [])),
+        "media_count": len(media),
         "stats": stats,
         "hashtags": hashtags,
         "urls": extract_urls(item),
-        "author": {
-            "username": user.get('screen_name')
-        },
-        "URL_GROUP": item.get('URL_GROUP')  # Preserve URL_GROUP from scraper
+        "author": tweet_author(user, profile_url),
+        "URL_GROUP": item.get('URL_GROUP'),  # Preserve URL_GROUP from scraper
+        "id": item.get('id') or None,
+        "timestamp": item.get('created_at_datetime') or None,
+        "language": item.get('lang') or None
     }
     
-    # Add optional fields only if they exist
-    if item.get('id'):
-        result["id"] = item.get('id')
-    if user.get('name'):
-        result["author"]["name"] = user.get('name')
-    if user.get('description'):
-        result["author"]["description"] = user.get('description')
-    if safe_int(user.get('followers_count', 0)) > 0:
-        result["author"]["followers_count"] = safe_int(user.get('followers_count', 0))
-    if profile_url:
-        result["author"]["profile_url"] = profile_url
-    if user.get('location'):
-        result["author"]["location"] = user.get('location')
-    if user.get('profile_image_url'):
-        result["author"]["profile_image_url"] = user.get('profile_image_url')
-    if item.get('created_at_datetime'):
-        result["timestamp"] = item.get('created_at_datetime')
-    if item.get('lang'):
-        result["language"] = item.get('lang')
-    
     # Remove None/null values and empty fields
     return clean_data(result)
 
@@ -545,44 +508,30 @@ def extract_urls(item):
 
 def safe_int(value):
     """Safely convert value to int, return 0 if conversion fails"""
+    # EAFP: scraped counts are nearly always ints or numeric strings, so the
+    # plain int() call is the common path and the handler is rarely taken
     try:
-        if isinstance(value, str) and value.isdigit():
-            return int(value)
-        elif isinstance(value, (int, float)):
-            return int(value)
-        else:
-            return 0
-    except (ValueError, TypeError):
+        return int(value)
+    except (ValueError, TypeError, OverflowError):
         return 0
 
 def extract_profile_url_from_tweet(tweet_url, username):
     """Extract profile URL from tweet URL by removing the /status/ part"""
-    if not tweet_url:
-        # Fallback to constructing from username
-        return f"https://x.com/{username}" if username else None
-    
-    try:
-        # Extract everything before /status/
-        if '/status/' in tweet_url:
-            profile_url = tweet_url.split('/status/')[0]
+    # Everything before /status/, in a single scan of the URL. A missing (or
+    # non-string) URL, or one without /status/, falls back to the username
+    if tweet_url and isinstance(tweet_url, str):
+        profile_url, sep, _ = tweet_url.partition('/status/')
+        if sep:
             return profile_url
-        else:
-            # If no /status/ found, fallback to username
-            return f"https://x.com/{username}" if username else None
-    except:
-        # Fallback in case of any error
-        return f"https://x.com/{username}" if username else None
+    return f"https://x.com/{username}" if username else None
 
 def load_youtube_data():
     """Load YouTube data from youtube_data.json"""
-    scrapers_dir = os.path.join(os.path.dirname(__file__), "scrapers")
-    youtube_file = os.path.join(scrapers_dir, "youtube_data.json")
-    
     try:
-        with open(youtube_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(YOUTUBE_FILE, "rb") as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
-        print(f"Warning: {youtube_file} not found")
+        print(f"Warning: {YOUTUBE_FILE} not found")
         return []
 
 def extract_youtube_fields(item):
@@ -604,40 +553,26 @@ def extract_youtube_fields(item):
     # YouTube Shorts are typically 60 seconds or less
     video_type = "video"  # default
     if duration:
-        # Parse duration (format: PT1M30S or PT45S)
-        try:
-            # Simple parsing for common formats
-            if 'PT' in str(duration):
-                duration_str = str(duration).replace('PT', '')
-                total_seconds = 0
-                
-                if 'M' in duration_str:
-                    minutes_part = duration_str.split('M')[0]
-                    total_seconds += int(minutes_part) * 60
-                    duration_str = duration_str.split('M')[1] if 'M' in duration_str else ''
-                
-                if 'S' in duration_str:
-                    seconds_part = duration_str.replace('S', '')
-                    if seconds_part:
-                        total_seconds += int(seconds_part)
-                
-                # YouTube Shorts are 60 seconds or less
-                if total_seconds <= 60:
-                    video_type = "short"
-        except:
-            # If parsing fails, default to video
-            pass
+        # Parse duration (format: PT1M30S or PT45S); anything else stays a video
+        match = _DURATION_RE.fullmatch(str(duration))
+        if match:
+            hours, minutes, seconds = match.groups()
+            total_seconds = int(hours or 0) * 3600 + int(minutes or 0) * 60 + int(seconds or 0)
+            
+            # YouTube Shorts are 60 seconds or less
+            if total_seconds <= 60:
+                video_type = "short"
     
     # Extract hashtags from title and description
     title = item.get('title', '')
     description = item.get('description', '')
-    combined_text = f"{title} {description}"
     hashtags = []
-    if combined_text:
-        words = combined_text.split()
-        hashtags = [word.strip('#') for word in words if word.startswith('#')]
+    for text in (title, description):
+        if text:
+            hashtags.extend(_HASHTAG_RE.findall(text))
     
-    # Build result with only essential fields
+    # Build result with only essential fields; optional fields are None (or
+    # empty) when missing and dropped by clean_data
     result = {
         "platform": "youtube",
         "content_type": "video",
@@ -652,173 +587,215 @@ def extract_youtube_fields(item):
         "hashtags": hashtags,
         "author": {
             "name": item.get('channelName'),
-            "subscribers_count": safe_int(item.get('subscriberCount', 0))
+            "subscribers_count": safe_int(item.get('subscriberCount', 0)),
+            "username": item.get('channelHandle') or None,
+            "profile_url": item.get('channelUrl') or None
         },
-        "URL_GROUP": item.get('URL_GROUP')  # Preserve URL_GROUP from scraper
+        "URL_GROUP": item.get('URL_GROUP'),  # Preserve URL_GROUP from scraper
+        "id": item.get('videoId') or None,
+        "timestamp": item.get('publishedAt') or None,
+        "duration": duration or None,
+        "thumbnail_url": thumbnail_url or None
     }
     
-    # Add optional fields only if they exist
-    if item.get('videoId'):
-        result["id"] = item.get('videoId')
-    if item.get('channelHandle'):
-        result["author"]["username"] = item.get('channelHandle')
-    if item.get('channelUrl'):
-        result["author"]["profile_url"] = item.get('channelUrl')
-    if item.get('publishedAt'):
-        result["timestamp"] = item.get('publishedAt')
-    if duration:
-        result["duration"] = duration
-    if thumbnail_url:
-        result["thumbnail_url"] = thumbnail_url
-    
     # Remove None/null values and empty fields
     return clean_data(result)
 
-def load_temp_data():
-    """Load all scraped data from temp_data.json"""
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_data.json")
-    
+def iter_temp_data():
+    """Yield the scraped items from temp_data.ndjson (one JSON record per line)"""
     try:
-        with open(temp_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        f = open(TEMP_FILE, "rb")
     except FileNotFoundError:
-        print(f"Warning: {temp_file} not found - no data to process")
-        return []
-    except Exception as e:
-        print(f"Error loading temp data: {e}")
-        return []
+        print(f"Warning: {TEMP_FILE} not found - no data to process")
+        return
+    with f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                print(f"Error loading temp data (line {line_number}): {e}")
 
 def clean_data(data):
     """Remove None/null values, empty lists/dicts, and unnecessary fields from data"""
-    if isinstance(data, dict):
-        cleaned = {}
-        for key, value in data.items():
-            # Skip None values, null values, empty strings, empty lists, and empty dicts
-            if value is None or value == "" or value == "null" or (isinstance(value, (list, dict)) and len(value) == 0):
-                continue
-            # Recursively clean nested dicts and lists
-            elif isinstance(value, dict):
-                cleaned_value = clean_data(value)
-                if cleaned_value:  # Only add non-empty dicts
-                    cleaned[key] = cleaned_value
-            elif isinstance(value, list):
-                cleaned_list = [clean_data(item) for item in value]
-                # Filter out None/null values from list
-                cleaned_list = [item for item in cleaned_list if item is not None and item != "null"]
-                if cleaned_list:  # Only add non-empty lists
-                    cleaned[key] = cleaned_list
+    if not isinstance(data, (dict, list)):
+        return data if data != "null" else None
+
+    # Iterative depth-first walk. Each frame holds the remaining entries of a
+    # source container, the cleaned container being built, and where that
+    # container is attached once it is finished (parent, key).
+    result = {} if isinstance(data, dict) else []
+    stack = [(iter(data.items()) if isinstance(data, dict) else iter(data), result, None, None)]
+
+    while stack:
+        entries, cleaned, parent, parent_key = stack[-1]
+        in_dict = type(cleaned) is dict
+        for entry in entries:
+            if in_dict:
+                key, value = entry
+                # Skip None values, null values and empty strings
+                if value is None or value == "" or value == "null":
+                    continue
             else:
-                # Keep all other values (strings, numbers, booleans)
+                key, value = None, entry
+
+            if isinstance(value, (dict, list)):
+                # Empty lists/dicts are dropped from dicts (but kept inside lists)
+                if in_dict and not value:
+                    continue
+                if isinstance(value, dict):
+                    stack.append((iter(value.items()), {}, cleaned, key))
+                else:
+                    stack.append((iter(value), [], cleaned, key))
+                break
+
+            # Keep all other values (strings, numbers, booleans)
+            if in_dict:
                 cleaned[key] = value
-        return cleaned
-    elif isinstance(data, list):
-        cleaned_list = [clean_data(item) for item in data]
-        return [item for item in cleaned_list if item is not None and item != "null"]
-    else:
-        return data if data != "null" else None
+            elif value is not None and value != "null":
+                cleaned.append(value)
+        else:
+            # Container finished: attach it to its parent
+            stack.pop()
+            if parent is None:
+                continue
+            if type(parent) is dict:
+                if cleaned:  # Only add non-empty dicts/lists
+                    parent[parent_key] = cleaned
+            else:
+                parent.append(cleaned)
 
-# Load all scraped data from temp_data.json
-all_temp_data = load_temp_data()
+    return result
 
-# Extract and combine data by processing each item based on its platform
-combined_data = []
+# URL_GROUP domain -> platform, for items that don't carry a platform field
+# (checked in order)
+PLATFORM_DOMAINS = (
+    ('instagram.com', 'instagram'),
+    ('linkedin.com', 'linkedin'),
+    ('twitter.com', 'twitter'),
+    ('x.com', 'twitter'),
+    ('youtube.com', 'youtube'),
+    ('tiktok.com', 'tiktok'),
+)
 
-for item in all_temp_data:
-    # Determine platform from the item data
-    platform = None
-    
-    # Check various ways platform might be stored
+# Platform -> (extractor, label for the progress output). An extractor returns
+# a falsy value for items that should be skipped.
+EXTRACTORS = {
+    'instagram': (extract_instagram_fields, 'Instagram'),
+    'tiktok': (extract_tiktok_fields, 'TikTok'),
+    'linkedin': (extract_linkedin_fields, 'LinkedIn'),
+    'twitter': (extract_twitter_fields, 'Twitter Tweet'),
+    'youtube': (extract_youtube_fields, 'YouTube'),
+}
+
+def detect_item_platform(item):
+    """Determine platform from the item data, falling back to its URL_GROUP"""
     if 'platform' in item:
-        platform = item['platform']
-    elif 'URL_GROUP' in item:
-        url_group = item['URL_GROUP']
-        if 'instagram.com' in url_group:
-            platform = 'instagram'
-        elif 'linkedin.com' in url_group:
-            platform = 'linkedin'
-        elif 'twitter.com' in url_group or 'x.com' in url_group:
-            platform = 'twitter'
-        elif 'youtube.com' in url_group:
-            platform = 'youtube'
-        elif 'tiktok.com' in url_group:
-            platform = 'tiktok'
-    
-    # Process based on detected platform
-    if platform == 'instagram':
-        if item.get("type") == "Video":
-            extracted = extract_instagram_fields(item)
-            combined_data.append(extracted)
-            # Removed ID and extra field printing as requested
-            print(f"Instagram - Platform: {extracted['platform']} | Type: {extracted['type']}")
-            print("-" * 50)
-    
-    elif platform == 'tiktok':
-        extracted = extract_tiktok_fields(item)
-        combined_data.append(extracted)
-        # Removed ID and extra field printing as requested
-        print(f"TikTok - Platform: {extracted['platform']} | Type: {extracted['type']}")
-        print("-" * 50)
-    
-    elif platform == 'linkedin':
-        extracted = extract_linkedin_fields(item)
-        combined_data.append(extracted)
-        # Removed ID and extra field printing as requested
-        print(f"LinkedIn - Platform: {extracted['platform']} | Type: {extracted['type']}")
-        print("-" * 50)
-    
-    elif platform == 'twitter':
-        extracted = extract_twitter_fields(item)
-        if extracted:  # Only process if extraction was successful
-            combined_data.append(extracted)
-            
-            if extracted['content_type'] == 'thread':
-                # Removed ID and extra field printing as requested
-                print(f"Twitter Thread - Platform: {extracted['platform']} | Type: {extracted['type']}")
-                print("-" * 50)
-            else:
-                # Removed ID and extra field printing as requested
-                print(f"Twitter Tweet - Platform: {extracted['platform']} | Type: {extracted['type']}")
-                print("-" * 50)
-    
-    elif platform == 'youtube':
-        extracted = extract_youtube_fields(item)
-        combined_data.append(extracted)
-        # Removed ID and extra field printing as requested
-        print(f"YouTube - Platform: {extracted['platform']} | Type: {extracted['type']}")
-        print("-" * 50)
-    
-    else:
-        print(f"Warning: Unknown platform for item")
+        return item['platform']
+    url_group = item.get('URL_GROUP')
+    if url_group:
+        for domain, platform in PLATFORM_DOMAINS:
+            if domain in url_group:
+                return platform
+    return None
 
-# Save combined data to data.json in the scrape folder (not scrapers folder)
-scrapers_dir = os.path.join(os.path.dirname(__file__), "scrapers")
-scrape_dir = os.path.dirname(__file__)  # This is the scrape folder
-output_file = os.path.join(scrape_dir, "data.json")
+def extract_item(item):
+    """Run the matching extractor on one item
+    
+    Returns:
+        (record, progress label); the record is falsy for skipped items and
+        the label is None when the item's platform is unknown
+    """
+    extractor = EXTRACTORS.get(detect_item_platform(item))
+    if extractor is None:
+        return None, None
+    extract, label = extractor
+    return extract(item), label
 
-with open(output_file, "w", encoding="utf-8") as f:
-    json.dump(combined_data, f, indent=2, ensure_ascii=False)
+def iter_processed_items(all_temp_data):
+    """Extract and yield the unified record for each item based on its platform"""
+    for extracted, label in map(extract_item, all_temp_data):
+        if label is None:
+            print(f"Warning: Unknown platform for item")
+            continue
+        if not extracted:  # Skipped, or extraction was unsuccessful
+            continue
+
+        if extracted.get('content_type') == 'thread':  # Reconstructed Twitter thread
+            label = 'Twitter Thread'
+        # Removed ID and extra field printing as requested. Lazy %-formatting:
+        # nothing is built unless INFO is enabled
+        logger.info("%s - Platform: %s | Type: %s\n%s", label, extracted['platform'], extracted['type'], SEP)
+        yield extracted
+
+def process_items(all_temp_data):
+    """Extract and combine data by processing each item based on its platform"""
+    return list(iter_processed_items(all_temp_data))
 
 # Clear the source files after processing
 def clear_source_files():
-    """Clear temp_data.json after processing"""
-    # Clear temp_data.json
-    temp_file = os.path.join(os.path.dirname(__file__), "temp_data.json")
+    """Clear temp_data.ndjson after processing"""
+    # Clear temp_data.ndjson
     try:
-        with open(temp_file, "w", encoding="utf-8") as f:
-            json.dump([], f)
-        print(f"Cleared: temp_data.json")
+        with open(TEMP_FILE, "wb"):
+            pass
+        print(f"Cleared: temp_data.ndjson")
     except Exception as e:
-        print(f"Error clearing temp_data.json: {e}")
-
-clear_source_files()
-
-print(f"\nEnhanced social media data processing completed!")
-print(f"Combined data saved to: {output_file}")
-print(f"Total items processed: {len(combined_data)}")
-print(f"\nData structure includes:")
-print(f"   - Comprehensive stats (views, likes, shares, comments)")
-print(f"   - All media URLs (videos, images) with proper extraction")
-print(f"   - Thread reconstruction with numbered tweets (tweet1, tweet2, ...)")
-print(f"   - Author information and verification status")
-print(f"   - Hashtags and URLs extraction")
-print(f"   - Timestamp and platform-specific metadata")
\ No newline at end of file
+        print(f"Error clearing temp_data.ndjson: {e}")
+
+def main(all_temp_data=None):
+    """Unify the scraped items into data.json
+    
+    Args:
+        all_temp_data: Scraped items handed over in memory (main.py). When None,
+            they are streamed from temp_data.ndjson, which is cleared afterwards.
+    
+    Returns:
+        The number of unified items written to data.json
+    """
+    from_temp_file = all_temp_data is None
+    if from_temp_file:
+        # Stream the scraped data from temp_data.ndjson, one record at a time
+        all_temp_data = iter_temp_data()
+
+    # Save combined data to data.json in the scrape folder (not scrapers folder).
+    # Stream each record into the array as it is extracted rather than
+    # building the combined list first. Every record is indented one level
+    # (JSON strings never contain a raw newline), so the file is byte-for-byte
+    # what dumping the whole list would produce. orjson writes raw UTF-8 (the
+    # ensure_ascii=False equivalent) by default.
+    # Written to a temp file and swapped in, so a reader parsing the old
+    # data.json (results.py may mmap it) never sees it truncated
+    total_items = 0
+    tmp_file = OUTPUT_FILE + ".tmp"
+    with open(tmp_file, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(b"[")
+        for extracted in iter_processed_items(all_temp_data):
+            record = orjson.dumps(extracted, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            f.write(b",\n  " if total_items else b"\n  ")
+            f.write(record.replace(b"\n", b"\n  "))
+            total_items += 1
+        f.write(b"\n]" if total_items else b"]")
+    os.replace(tmp_file, OUTPUT_FILE)
+
+    if from_temp_file:
+        clear_source_files()
+
+    print(f"\nEnhanced social media data processing completed!")
+    print(f"Combined data saved to: {OUTPUT_FILE}")
+    print(f"Total items processed: {total_items}")
+    print(f"\nData structure includes:")
+    print(f"   - Comprehensive stats (views, likes, shares, comments)")
+    print(f"   - All media URLs (videos, images) with proper extraction")
+    print(f"   - Thread reconstruction with numbered tweets (tweet1, tweet2, ...)")
+    print(f"   - Author information and verification status")
+    print(f"   - Hashtags and URLs extraction")
+    print(f"   - Timestamp and platform-specific metadata")
+
+    return total_items
+
+if __name__ == "__main__":
+    # Show the per-item progress lines when run as a script
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    main()
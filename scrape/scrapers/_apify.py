@@ -0,0 +1,42 @@
+from apify_client import ApifyClient
+import math
+import orjson
+import sys
+import os
+import time
+
+# Add the root directory to Python path to import admin
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from admin import APIFY_KEY
+
+# Initialize the ApifyClient with your Apify API token. One client per process:
+# every scraper (and Twitter's thread expansion) reuses its HTTP session
+client = ApifyClient(APIFY_KEY)
+
+def actor_call_timeouts(deadline=None):
+    """Keyword arguments for an actor .call() that has to finish by deadline
+    (a time.monotonic() value): the run is aborted on Apify's side at that
+    point instead of running on (and billing) after the caller gave up
+
+    Returns:
+        {"timeout_secs", "wait_secs"}, or {} when there is no deadline
+    """
+    if deadline is None:
+        return {}
+    secs = max(1, math.ceil(deadline - time.monotonic()))
+    return {"timeout_secs": secs, "wait_secs": secs}
+
+# Where the scraper scripts collect their items for retrieve.py
+TEMP_DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'temp_data.ndjson')
+
+def append_temp_data(items):
+    """Append scraped items to temp_data.ndjson, one JSON record per line, so
+    earlier runs' records are never re-read or rewritten
+
+    Returns:
+        The path of the temp data file
+    """
+    with open(TEMP_DATA_FILE, "ab", buffering=1 << 20) as f:  # 1 MiB buffer, few large writes
+        for item in items:
+            f.write(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS))
+    return TEMP_DATA_FILE
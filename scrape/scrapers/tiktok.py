@@ -1,54 +1,41 @@
-from apify_client import ApifyClient
 import sys
-import os
-import json
 
-# Add the root directory to Python path to import admin
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from admin import APIFY_KEY
+# Shared Apify client; resolves both as a package module (main.py) and when
+# run as a script from the scrapers folder
+if __package__:
+    from ._apify import client, actor_call_timeouts, append_temp_data
+else:
+    from _apify import client, actor_call_timeouts, append_temp_data
 
-# Initialize the ApifyClient with your Apify API token
-client = ApifyClient(APIFY_KEY)
-
-# Store the input URL for grouping - will be dynamically updated by main.py
+# Default input URL when run as a script (override with argv[1]); main.py passes the URL to run()
 tiktok_url = "https://www.tiktok.com/@jennaezarik"
-URL_GROUP = tiktok_url  # Store the input URL for grouping
-
-# Prepare the Actor input
-run_input = { 
-    "profiles": [tiktok_url],
-    "resultsPerPage": 50,  # Keep max results for better content selection
-    "oldestPostDateUnified": "7 days"  # Keep 7 days as required
-}
-
-# Run the Actor and wait for it to finish
-run = client.actor("clockworks/tiktok-profile-scraper").call(run_input=run_input)
- 
-# Fetch and save Actor results from the run's dataset to JSON file
-data = []
-for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-    # Add URL_GROUP to each item
-    item['URL_GROUP'] = URL_GROUP
-    data.append(item)
-
-# Save data to temp_data.json (append mode)
-temp_data_file = os.path.join(os.path.dirname(__file__), "..", "temp_data.json")
-
-# Load existing temp data if it exists
-existing_data = []
-if os.path.exists(temp_data_file):
-    try:
-        with open(temp_data_file, "r", encoding="utf-8") as f:
-            existing_data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        existing_data = []
-
-# Append new data to existing data
-existing_data.extend(data)
-
-# Save all data back to temp_data.json
-with open(temp_data_file, "w", encoding="utf-8") as f:
-    json.dump(existing_data, f, indent=2, ensure_ascii=False)
-
-print(f"Data appended to: {temp_data_file}")
-print(f"Total items scraped: {len(data)}")
\ No newline at end of file
+
+def run(tiktok_url, deadline=None):
+    """Scrape recent videos for a TikTok profile and tag each item with its URL_GROUP"""
+    URL_GROUP = tiktok_url  # Store the input URL for grouping
+
+    # Prepare the Actor input
+    run_input = {
+        "profiles": [tiktok_url],
+        "resultsPerPage": 50,  # Keep max results for better content selection
+        "oldestPostDateUnified": "7 days"  # Keep 7 days as required
+    }
+
+    # Run the Actor and wait for it to finish
+    actor_run = client.actor("clockworks/tiktok-profile-scraper").call(run_input=run_input, **actor_call_timeouts(deadline))
+
+    # Fetch Actor results from the run's dataset
+    data = []
+    for item in client.dataset(actor_run["defaultDatasetId"]).iterate_items():
+        # Add URL_GROUP to each item
+        item['URL_GROUP'] = URL_GROUP
+        data.append(item)
+
+    print(f"Total items scraped: {len(data)}")
+    return data
+
+if __name__ == "__main__":
+    data = run(sys.argv[1] if len(sys.argv) > 1 else tiktok_url)
+
+    temp_data_file = append_temp_data(data)
+    print(f"Data appended to: {temp_data_file}")
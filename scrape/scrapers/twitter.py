@@ -1,14 +1,135 @@
-from apify_client import ApifyClient
 import sys
 import os
-import json
 from datetime import datetime, timedelta
 import re
-import requests
+import asyncio
+import httpx
+from functools import lru_cache
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared Apify client; resolves both as a package module (main.py) and when
+# run as a script from the scrapers folder
+if __package__:
+    from ._apify import client, actor_call_timeouts, append_temp_data
+else:
+    from _apify import client, actor_call_timeouts, append_temp_data
+
+# Quote-tweet, embed and media container tags on UnrollNow pages; the first
+# tweet ID after one of these opens belongs to the container, not the thread
+_CONTAINER_TAG_RES = {
+    kind: re.compile(rf'<div[^>]*class="[^"]*{kind}[^"]*"[^>]*>', re.IGNORECASE)
+    for kind in ('quote', 'embed', 'media')
+}
+_WORD_CHAR_RE = re.compile(r'\w')
+
+# Common thread indicators in tweet text: "1/", "1.", "Part 1", "2 of 5", etc.
+_THREAD_INDICATOR_RE = re.compile(r'\b1[/.]\s*\d+\s*part|\bpart\s*1\b|\b\d+\s*/\s*\d+|\b\d+\s*of\s*\d+|\bthread\b|\b🧵\b', re.IGNORECASE)
+
+@lru_cache(maxsize=64)
+def _thread_page_token_re(username):
+    """Compiled single-pass tokenizer for UnrollNow pages
+    
+    Tokens: the start of a container tag (zero-width, so IDs inside the tag
+    are still seen), href="/<username>/status/<id>" links, data-tweet-id
+    attributes, and any other run of 18+ digits.
+    """
+    user_href = rf'|href="/{re.escape(username)}/status/(?P<href>\d{{18,19}})"' if username else ''
+    return re.compile(
+        r'(?P<container>(?=<div[^>]*class="[^"]*(?:quote|embed|media)[^"]*"[^>]*>))'
+        + user_href
+        + r'|(?-i:data-tweet-id=")(?P<data>\d{18,19})"'
+        r'|(?P<digits>\d{18,})',
+        re.IGNORECASE,
+    )
+
+def scan_thread_page(html, target_username=None):
+    """Collect the tweet IDs on an UnrollNow page in a single scan
+    
+    Args:
+        html: UnrollNow page HTML
+        target_username: When set, also collect href="/<username>/status/<id>" IDs
+    
+    Returns:
+        (user_status_ids, data_tweet_ids, standalone_ids, container_ids): IDs in
+        page order from the username's status links, from data-tweet-id
+        attributes, and every word-bounded 18-19 digit ID; plus, per container
+        kind, the set of first IDs following each container tag
+    """
+    user_status_ids, data_tweet_ids, standalone_ids = [], [], []
+    container_ids = {kind: set() for kind in _CONTAINER_TAG_RES}
+    open_containers = {}  # Container kind -> end of the tag still waiting for its ID
+
+    for match in _thread_page_token_re(target_username).finditer(html):
+        token = match.lastgroup
+        if token == 'container':
+            start = match.start()
+            for kind, tag_re in _CONTAINER_TAG_RES.items():
+                if kind not in open_containers and (tag := tag_re.match(html, start)):
+                    open_containers[kind] = tag.end()
+            continue
+
+        start, end = match.span(token)
+        digits = match.group(token)
+        if token == 'href':
+            user_status_ids.append(digits)
+        elif token == 'data':
+            data_tweet_ids.append(digits)
+
+        if len(digits) <= 19 and not (start and _WORD_CHAR_RE.match(html, start - 1)) and not _WORD_CHAR_RE.match(html, end):
+            standalone_ids.append(digits)
 
-# Add the root directory to Python path to import admin
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
-from admin import APIFY_KEY
+        # The first 18-19 digits after a container tag closes are its ID
+        for kind in [kind for kind, tag_end in open_containers.items() if start >= tag_end]:
+            container_ids[kind].add(digits[:19])
+            del open_containers[kind]
+
+    return user_status_ids, data_tweet_ids, standalone_ids, container_ids
+
+# data-tweet-id attributes as the username-context fallback matches them (any case)
+_DATA_TWEET_ID_ANYCASE_RE = re.compile(r'data-tweet-id="(\d{18,19})"', re.IGNORECASE)
+
+@lru_cache(maxsize=64)
+def _user_mention_re(username):
+    """Compiled pattern for every (possibly overlapping) mention of <username> or @<username>"""
+    user = re.escape(username)
+    return re.compile(rf'(?=({user}|@{user}))', re.IGNORECASE)
+
+def user_context_tweet_ids(html, username):
+    """Tweet IDs from data-tweet-id attributes that appear in a context with the username
+    
+    Same IDs, in the same order, as the non-overlapping matches of
+    "<user>.*?data-tweet-id" | "data-tweet-id.*?<user>" over the whole page,
+    but found by walking the mention and attribute positions once instead of
+    letting each lazy DOTALL scan run to the end of the page.
+    """
+    mentions = [(m.start(), m.end(1)) for m in _user_mention_re(username).finditer(html)]
+    attributes = [(m.start(), m.end(), m.group(1)) for m in _DATA_TWEET_ID_ANYCASE_RE.finditer(html)]
+    if not mentions or not attributes:
+        return []
+    mention_starts = [start for start, _ in mentions]
+    attribute_starts = [start for start, _, _ in attributes]
+
+    tweet_ids = []
+    cursor = 0
+    while True:
+        # A match starts at the first mention (followed by an attribute) or the
+        # first attribute (followed by a mention) at or after the cursor;
+        # when both start at the same position the mention form is tried first
+        m = bisect_left(mention_starts, cursor)
+        a = bisect_left(attribute_starts, cursor)
+        mention_ok = m < len(mentions) and attribute_starts[-1] >= mentions[m][1]
+        attribute_ok = a < len(attributes) and mention_starts[-1] >= attributes[a][1]
+        if mention_ok and (not attribute_ok or mentions[m][0] <= attributes[a][0]):
+            # The first attribute after the mention
+            _, cursor, tweet_id = attributes[bisect_left(attribute_starts, mentions[m][1])]
+        elif attribute_ok:
+            # The attribute, up to the first mention after it
+            tweet_id = attributes[a][2]
+            cursor = mentions[bisect_left(mention_starts, attributes[a][1])][1]
+        else:
+            return tweet_ids
+        tweet_ids.append(tweet_id)
 
 def extract_username_from_url(url):
     """Extract username from Twitter/X URL"""
@@ -16,44 +137,56 @@ def extract_username_from_url(url):
     match = re.search(pattern, url)
     return match.group(1) if match else None
 
-def fetch_unroll_html(tweet_id):
+# Concurrent UnrollNow page fetches per scrape
+UNROLL_CONCURRENCY = int(os.getenv('UNROLL_CONCURRENCY', '8'))
+UNROLL_TIMEOUT = 10  # Seconds per page (reduced from 30)
+UNROLL_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+async def fetch_unroll_html(client, semaphore, tweet_id):
     """Fetch HTML from UnrollNow for thread detection"""
     url = f"https://unrollnow.com/status/{tweet_id}"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    try:
-        response = requests.get(url, headers=headers, timeout=10)  # Reduced from 30 to 10 seconds
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        print(f"Error fetching UnrollNow HTML for tweet {tweet_id}: {e}")
-        return None
+    async with semaphore:
+        print(f"Checking UnrollNow for tweet: {tweet_id}")
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.text
+        except Exception as e:
+            print(f"Error fetching UnrollNow HTML for tweet {tweet_id}: {e}")
+            return None
+
+async def fetch_unroll_htmls_async(tweet_ids):
+    """Fetch the UnrollNow pages for all tweet IDs concurrently, in input order"""
+    # Created per call: run() executes in a fresh event loop each time
+    semaphore = asyncio.Semaphore(UNROLL_CONCURRENCY)
+    async with httpx.AsyncClient(headers=UNROLL_HEADERS, timeout=UNROLL_TIMEOUT) as client:
+        return await asyncio.gather(*(fetch_unroll_html(client, semaphore, tweet_id) for tweet_id in tweet_ids))
+
+def fetch_unroll_htmls(tweet_ids):
+    """Fetch the UnrollNow page once per distinct tweet ID, keyed by ID (run() is called from a worker thread, so no loop is running)"""
+    unique_ids = list(dict.fromkeys(tweet_ids))
+    if not unique_ids:
+        return {}
+    return dict(zip(unique_ids, asyncio.run(fetch_unroll_htmls_async(unique_ids))))
 
 def extract_thread_tweet_ids(html, target_username=None):
     """Extract thread tweet IDs from UnrollNow HTML, excluding quoted tweets and attachments"""
     if not html:
         return []
 
+    # One scan of the page collects every kind of ID used below
+    user_status_ids, data_thread_ids, all_tweet_ids, container_ids = scan_thread_page(html, target_username)
+
     # If we have a target username, only extract tweet IDs associated with that user
     if target_username:
-        # Look for tweet IDs in URLs or data attributes that contain the target username
-        # Pattern: href="/username/status/tweet_id" or data-username="username"
-        user_pattern = rf'(?:href="/{target_username}/status/|data-username="{target_username}")'
-        user_matches = re.findall(user_pattern, html, re.IGNORECASE)
-
-        # Extract tweet IDs that are associated with the target username
-        tweet_url_pattern = rf'href="/{target_username}/status/(\d{{18,19}})"'
-        thread_ids = re.findall(tweet_url_pattern, html, re.IGNORECASE)
-
-        # Also look for tweet IDs in data-tweet-id attributes
-        tweet_data_pattern = r'data-tweet-id="(\d{18,19})"'
-        data_thread_ids = re.findall(tweet_data_pattern, html)
-        thread_ids.extend(data_thread_ids)
+        # Tweet IDs in URLs that contain the target username
+        # (href="/username/status/tweet_id"), then in data-tweet-id attributes
+        thread_ids = user_status_ids + data_thread_ids
 
         # Exclude quoted tweets (these appear in quote-tweet containers)
-        quoted_tweet_pattern = r'<div[^>]*class="[^"]*quote[^"]*"[^>]*>.*?(\d{18,19})'
-        quoted_ids = set(re.findall(quoted_tweet_pattern, html, re.DOTALL | re.IGNORECASE))
+        quoted_ids = container_ids['quote']
 
         # Filter out quoted tweet IDs
         thread_ids = [tid for tid in thread_ids if tid not in quoted_ids]
@@ -61,44 +194,25 @@ def extract_thread_tweet_ids(html, target_username=None):
         # If we didn't find tweet URLs, fall back to data-tweet-id attributes near the username
         if not thread_ids:
             # Find tweet IDs in data attributes that are near the target username
-            tweet_data_pattern = r'data-tweet-id="(\d{18,19})"'
-            all_tweet_ids = re.findall(tweet_data_pattern, html)
+            all_tweet_ids = data_thread_ids
 
             # Filter to only include tweet IDs that appear in contexts with the target username
-            username_context_pattern = rf'(?:{target_username}|@{target_username}).*?data-tweet-id="(\d{{18,19}})"|data-tweet-id="(\d{{18,19}})".*?(?:{target_username}|@{target_username})'
-            context_matches = re.findall(username_context_pattern, html, re.DOTALL | re.IGNORECASE)
-
-            # Extract tweet IDs from context matches
-            context_tweet_ids = []
-            for match in context_matches:
-                # Each match tuple may have empty strings, filter them out
-                tweet_ids_in_match = [tid for tid in match if tid]
-                context_tweet_ids.extend(tweet_ids_in_match)
+            context_tweet_ids = user_context_tweet_ids(html, target_username)
 
             # Combine and deduplicate
             thread_ids = list(set(all_tweet_ids) & set(context_tweet_ids)) if context_tweet_ids else all_tweet_ids[:10]  # Limit to reasonable number
+
+        # Remove duplicates while preserving order (the other branch dedups as it filters)
+        thread_ids = list(dict.fromkeys(thread_ids))
     else:
         # Original logic when no target username is provided
-        # Find all tweet IDs in the HTML
-        all_tweet_ids = re.findall(r'\b\d{18,19}\b', html)
-
+        # All standalone tweet IDs in the HTML
         if not all_tweet_ids:
             return []
 
-        # Remove quoted tweets (these appear in quote-tweet containers)
-        quoted_tweet_pattern = r'<div[^>]*class="[^"]*quote[^"]*"[^>]*>.*?(\d{18,19})'
-        quoted_ids = set(re.findall(quoted_tweet_pattern, html, re.DOTALL | re.IGNORECASE))
-
-        # Remove embedded/attachment tweets (these appear in different containers)
-        embedded_pattern = r'<div[^>]*class="[^"]*embed[^"]*"[^>]*>.*?(\d{18,19})'
-        embedded_ids = set(re.findall(embedded_pattern, html, re.DOTALL | re.IGNORECASE))
-
-        # Remove video attachments and media containers
-        media_pattern = r'<div[^>]*class="[^"]*media[^"]*"[^>]*>.*?(\d{18,19})'
-        media_ids = set(re.findall(media_pattern, html, re.DOTALL | re.IGNORECASE))
-
-        # Combine all IDs to exclude
-        excluded_ids = quoted_ids | embedded_ids | media_ids
+        # Remove quoted tweets, embedded/attachment tweets and video
+        # attachments/media containers
+        excluded_ids = container_ids['quote'] | container_ids['embed'] | container_ids['media']
 
         # Filter out excluded IDs and remove duplicates while preserving order
         seen = set()
@@ -108,26 +222,23 @@ def extract_thread_tweet_ids(html, target_username=None):
                 seen.add(tweet_id)
                 thread_ids.append(tweet_id)
 
-    # Remove duplicates while preserving order and limit to reasonable number
-    seen = set()
-    unique_thread_ids = []
-    for tweet_id in thread_ids:
-        if tweet_id not in seen:
-            seen.add(tweet_id)
-            unique_thread_ids.append(tweet_id)
-
-    return unique_thread_ids[:25]  # Increased limit to 25 to capture longer threads
+    # Limit to reasonable number
+    return thread_ids[:25]  # Increased limit to 25 to capture longer threads
 
 def get_highest_quality_video(video_info):
     """Extract highest quality video URL from video_info"""
     if not video_info or 'variants' not in video_info:
         return None
     
-    mp4_variants = [v for v in video_info['variants'] if v.get('content_type') == 'video/mp4']
-    if mp4_variants:
-        highest = max(mp4_variants, key=lambda x: x.get('bitrate', 0))
-        return highest.get('url')
-    return None
+    # Single pass over the variants; the first mp4 wins ties, as with max()
+    highest = None
+    highest_bitrate = 0
+    for variant in video_info['variants']:
+        if variant.get('content_type') == 'video/mp4':
+            bitrate = variant.get('bitrate', 0)
+            if highest is None or bitrate > highest_bitrate:
+                highest, highest_bitrate = variant, bitrate
+    return highest.get('url') if highest is not None else None
 
 def enhance_tweet_data(tweet):
     """Enhance tweet data while preserving original structure from twitter_data.json"""
@@ -144,9 +255,81 @@ def enhance_tweet_data(tweet):
     
     return tweet
 
-def classify_and_process_tweets(tweets):
+# Check every tweet on UnrollNow, not just those with a thread signal
+UNROLL_ALL_TWEETS = os.getenv('UNROLL_ALL_TWEETS', '0') == '1'
+
+def is_thread_candidate(tweet):
+    """Whether a tweet shows any sign of being part of a thread: a reply (to
+    the author's previous tweet), a link, or thread wording/numbering"""
+    if tweet.get('in_reply_to_status_id') or tweet.get('in_reply_to_status_id_str'):
+        return True
+    text = tweet.get('text', '') or ''
+    return 't.co/' in text or 'thread' in text.lower() or '🧵' in text or bool(_THREAD_INDICATOR_RE.search(text))
+
+# Tweets requested per thread-expansion actor run; all detected threads share
+# runs, so actor start-up is paid once per batch rather than once per thread
+THREAD_BATCH_MAX_TWEETS = int(os.getenv('THREAD_BATCH_MAX_TWEETS', '100'))
+
+# Batches whose actor runs are waited on at the same time
+THREAD_BATCH_WORKERS = int(os.getenv('THREAD_BATCH_WORKERS', '4'))
+
+def fetch_thread_batch(client, batch, deadline=None):
+    """Run the tweets scraper for one batch of tweet IDs and return its items"""
+    run_input = {
+        "mode": "Get a Few Tweets",
+        "tweets": ",".join(batch),
+        "max_results": len(batch)
+    }
+    run = client.actor("scrape.badger/twitter-tweets-scraper").call(run_input=run_input, **actor_call_timeouts(deadline))
+    return list(client.dataset(run["defaultDatasetId"]).iterate_items())
+
+def fetch_thread_tweets(client, tweet_ids, main_username, deadline=None):
+    """Fetch thread tweets in batched actor runs
+    
+    Args:
+        client: ApifyClient to run the tweets scraper with
+        tweet_ids: IDs of the tweets of every detected thread (may repeat)
+        main_username: Only this user's non-quote tweets are kept
+        deadline: time.monotonic() by which the actor runs are aborted, if any
+    
+    Returns:
+        (fetched, failed): enhanced tweets by ID, and the error for each ID
+        whose actor run failed
+    """
+    fetched, failed = {}, {}
+    unique_ids = list(dict.fromkeys(tweet_ids))
+    batches = [unique_ids[i:i + THREAD_BATCH_MAX_TWEETS] for i in range(0, len(unique_ids), THREAD_BATCH_MAX_TWEETS)]
+    if not batches:
+        return fetched, failed
+
+    # The runs are independent server-side jobs, so their waits overlap;
+    # results are still handled in batch order
+    with ThreadPoolExecutor(max_workers=min(len(batches), THREAD_BATCH_WORKERS)) as pool:
+        futures = [pool.submit(fetch_thread_batch, client, batch, deadline) for batch in batches]
+
+        for batch, future in zip(batches, futures):
+            try:
+                items = future.result()
+            except Exception as e:
+                failed.update(dict.fromkeys(batch, e))
+                continue
+
+            for item in items:
+                # Filter to only include tweets from the same user and exclude quoted tweets
+                item_username = item.get('user', {}).get('screen_name')
+                is_quoted = item.get('is_quote_status', False)
+                if item_username == main_username and not is_quoted:
+                    # A tweet the actor returns more than once is enhanced
+                    # only the first time; that copy is kept
+                    if (item_id := item.get('id')) not in fetched:
+                        fetched[item_id] = enhance_tweet_data(item)
+                else:
+                    print(f"Filtering out tweet from different user or quoted tweet: @{item_username}")
+
+    return fetched, failed
+
+def classify_and_process_tweets(tweets, deadline=None):
     """Classify tweets as single tweets or threads and process accordingly"""
-    client = ApifyClient(APIFY_KEY)
     classified_data = []
 
     # Get the main username from the first tweet to ensure consistency
@@ -154,25 +337,39 @@ def classify_and_process_tweets(tweets):
     if tweets:
         main_username = tweets[0].get('user', {}).get('screen_name')
 
+    # Only process tweets from the main user
+    main_tweets = []
     for tweet in tweets:
-        tweet_id = tweet.get('id')
-        text = tweet.get('text', '')
         current_username = tweet.get('user', {}).get('screen_name')
-
-        # Only process tweets from the main user
         if main_username and current_username != main_username:
-            print(f"Skipping tweet {tweet_id} from different user: @{current_username}")
+            print(f"Skipping tweet {tweet.get('id')} from different user: @{current_username}")
             continue
+        main_tweets.append(tweet)
+
+    # Check UnrollNow for thread detection only for tweets with a thread
+    # signal (all tweets with UNROLL_ALL_TWEETS=1); their pages are fetched
+    # up front, concurrently
+    candidates = [UNROLL_ALL_TWEETS or is_thread_candidate(tweet) for tweet in main_tweets]
+    htmls = fetch_unroll_htmls([tweet.get('id') for tweet, candidate in zip(main_tweets, candidates) if candidate])
+
+    # First pass: detect the thread structure of every tweet
+    detected = []  # (tweet_id, enhanced tweet, thread IDs)
+    page_thread_ids = {}  # Tweet ID -> thread IDs on its page, scanned once per page
+    for tweet, candidate in zip(main_tweets, candidates):
+        tweet_id = tweet.get('id')
+        text = tweet.get('text', '')
 
         # Enhance the original tweet data
         enhanced_tweet = enhance_tweet_data(tweet)
 
-        # Always check UnrollNow for thread detection (no pre-filtering by text)
-        print(f"Checking UnrollNow for tweet: {tweet_id}")
+        if not candidate:  # Obvious single tweet
+            detected.append((tweet_id, enhanced_tweet, []))
+            continue
 
-        # Fetch UnrollNow HTML to get thread structure
-        html = fetch_unroll_html(tweet_id)
-        thread_ids = extract_thread_tweet_ids(html, main_username)
+        # Extract the thread structure from the UnrollNow HTML
+        if tweet_id not in page_thread_ids:
+            page_thread_ids[tweet_id] = extract_thread_tweet_ids(htmls[tweet_id], main_username)
+        thread_ids = page_thread_ids[tweet_id]
 
         # Additional check: if the tweet text contains a thread link, try to extract tweet IDs from it
         if not thread_ids and ('t.co/' in text or 'thread' in text.lower() or '🧵' in text):
@@ -185,155 +382,118 @@ def classify_and_process_tweets(tweets):
 
         if len(thread_ids) > 1:
             print(f"Thread detected with {len(thread_ids)} tweets")
+        detected.append((tweet_id, enhanced_tweet, thread_ids))
 
-            # Process all threads without limits
-            run_input = {
-                "mode": "Get a Few Tweets",
-                "tweets": ",".join(thread_ids),
-                "max_results": len(thread_ids)
-            }
+    # Fetch the tweets of all detected threads together, in as few actor runs
+    # as possible (process all threads without limits)
+    fetched_tweets, failed_ids = fetch_thread_tweets(
+        client, [tid for _, _, thread_ids in detected if len(thread_ids) > 1 for tid in thread_ids], main_username, deadline
+    )
 
-            try:
-                run = client.actor("scrape.badger/twitter-tweets-scraper").call(run_input=run_input)
-                thread_tweets = []
-
-                for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-                    # Filter to only include tweets from the same user and exclude quoted tweets
-                    item_username = item.get('user', {}).get('screen_name')
-                    is_quoted = item.get('is_quote_status', False)
-                    if item_username == main_username and not is_quoted:
-                        enhanced_item = enhance_tweet_data(item)
-                        thread_tweets.append(enhanced_item)
-                    else:
-                        print(f"Filtering out tweet from different user or quoted tweet: @{item_username}")
-
-                if thread_tweets:  # Only create thread if we have valid tweets
-                    # Sort tweets by their position in thread_ids to maintain order
-                    id_to_position = {tid: i for i, tid in enumerate(thread_ids)}
-                    thread_tweets.sort(key=lambda x: id_to_position.get(x.get('id'), 999))
-
-                    # Double-check that we have the main tweet in the thread
-                    main_tweet_in_thread = any(tweet.get('id') == tweet_id for tweet in thread_tweets)
-                    if not main_tweet_in_thread:
-                        # Add the main tweet to the thread if it's not already there
-                        thread_tweets.insert(0, enhanced_tweet)
-                        print(f"Added main tweet to thread: {tweet_id}")
-
-                    # Return thread data in enhanced format
-                    classified_data.append({
-                        'content_type': 'thread',
-                        'thread_id': tweet_id,
-                        'thread_length': len(thread_tweets),
-                        'ordered_tweets': thread_tweets,  # All tweets in proper order for reconstruction
-                        'scraped_at': datetime.now().isoformat()
-                    })
-                else:
-                    # If no valid thread tweets found, treat as single tweet
-                    print(f"No valid thread tweets found for {tweet_id}, treating as single tweet")
-                    classified_data.append({
-                        'content_type': 'tweet',
-                        **enhanced_tweet,
-                        'scraped_at': datetime.now().isoformat()
-                    })
-
-            except Exception as e:
-                print(f"Error processing thread {tweet_id}: {e}")
-                # Fallback to single tweet
+    # Second pass: reassemble each thread from the fetched tweets
+    for tweet_id, enhanced_tweet, thread_ids in detected:
+        if len(thread_ids) <= 1:
+            print(f"No thread found, treating as single tweet: {tweet_id}")
+        elif (failed := [tid for tid in thread_ids if tid in failed_ids]):
+            print(f"Error processing thread {tweet_id}: {failed_ids[failed[0]]}")
+            # Fallback to single tweet
+        else:
+            # Tweets in their position in thread_ids to maintain order
+            thread_order = dict.fromkeys(thread_ids)
+            thread_tweets = [fetched_tweets[tid] for tid in thread_order if tid in fetched_tweets]
+
+            if thread_tweets:  # Only create thread if we have valid tweets
+                # Double-check that we have the main tweet in the thread (the
+                # thread holds exactly the fetched tweets of thread_ids, by ID)
+                main_tweet_in_thread = tweet_id in thread_order and tweet_id in fetched_tweets
+                if not main_tweet_in_thread:
+                    # Add the main tweet to the thread if it's not already there
+                    thread_tweets.insert(0, enhanced_tweet)
+                    print(f"Added main tweet to thread: {tweet_id}")
+
+                # Return thread data in enhanced format
                 classified_data.append({
-                    'content_type': 'tweet',
-                    **enhanced_tweet,
+                    'content_type': 'thread',
+                    'thread_id': tweet_id,
+                    'thread_length': len(thread_tweets),
+                    'ordered_tweets': thread_tweets,  # All tweets in proper order for reconstruction
                     'scraped_at': datetime.now().isoformat()
                 })
-        else:
-            print(f"No thread found, treating as single tweet: {tweet_id}")
-            classified_data.append({
-                'content_type': 'tweet',
-                **enhanced_tweet,
-                'scraped_at': datetime.now().isoformat()
-            })
+                continue
 
-    return classified_data
+            # If no valid thread tweets found, treat as single tweet
+            print(f"No valid thread tweets found for {tweet_id}, treating as single tweet")
 
-# Initialize the ApifyClient
-client = ApifyClient(APIFY_KEY)
+        classified_data.append({
+            'content_type': 'tweet',
+            **enhanced_tweet,
+            'scraped_at': datetime.now().isoformat()
+        })
 
-# Store the input URL for grouping - will be dynamically updated by main.py
-twitter_url = "https://x.com/elonmusk"
-URL_GROUP = twitter_url  # Store the input URL for grouping
-username = extract_username_from_url(twitter_url)
-
-if not username:
-    raise ValueError(f"Could not extract username from URL: {twitter_url}")
-
-# Calculate dates dynamically - 7 days ago to today (keep full week as required)
-today = datetime.now()
-seven_days_ago = today - timedelta(days=7)
-start_date = seven_days_ago.strftime("%Y-%m-%d")
-end_date = today.strftime("%Y-%m-%d")
-
-# Prepare the Actor input with date filtering
-run_input = {
-    "mode": "Advanced Search",
-    "query": f"from:{username} -filter:replies since:{start_date} until:{end_date}",
-    "query_type": "Latest",
-    "max_results": 10,  # Keep max results for better content selection
-}
-
-print(f"Starting enhanced Twitter scraper for @{username}")
-print(f"Date range: {start_date} to {end_date}")
+    return classified_data
 
-# Run the Actor
-run = client.actor("scrape.badger/twitter-tweets-scraper").call(run_input=run_input)
+# Default input URL when run as a script (override with argv[1]); main.py passes the URL to run()
+twitter_url = "https://x.com/elonmusk"
 
-# Fetch initial tweet data
-raw_tweets = []
-for item in client.dataset(run["defaultDatasetId"]).iterate_items():
-    if 'id' in item and item['id']:
-        tweet_username = item.get('user', {}).get('screen_name', username)
-        item['tweet_url'] = f"https://x.com/{tweet_username}/status/{item['id']}"
-    # Add URL_GROUP to each tweet
-    item['URL_GROUP'] = URL_GROUP
-    raw_tweets.append(item)
+def run(twitter_url, deadline=None):
+    """Scrape the past week's tweets for a Twitter/X profile, reconstruct threads, and tag each item with its URL_GROUP"""
+    URL_GROUP = twitter_url  # Store the input URL for grouping
+    username = extract_username_from_url(twitter_url)
+
+    if not username:
+        raise ValueError(f"Could not extract username from URL: {twitter_url}")
+
+    # Calculate dates dynamically - 7 days ago to today (keep full week as required)
+    today = datetime.now()
+    seven_days_ago = today - timedelta(days=7)
+    start_date = seven_days_ago.strftime("%Y-%m-%d")
+    end_date = today.strftime("%Y-%m-%d")
+
+    # Prepare the Actor input with date filtering
+    run_input = {
+        "mode": "Advanced Search",
+        "query": f"from:{username} -filter:replies since:{start_date} until:{end_date}",
+        "query_type": "Latest",
+        "max_results": 10,  # Keep max results for better content selection
+    }
 
-print(f"Retrieved {len(raw_tweets)} initial tweets")
+    print(f"Starting enhanced Twitter scraper for @{username}")
+    print(f"Date range: {start_date} to {end_date}")
 
-# Classify and process tweets (detect threads vs single tweets)
-processed_data = classify_and_process_tweets(raw_tweets)
+    # Run the Actor
+    actor_run = client.actor("scrape.badger/twitter-tweets-scraper").call(run_input=run_input, **actor_call_timeouts(deadline))
 
-# Save processed data to temp_data.json (append mode)
-import os
-temp_data_file = os.path.join(os.path.dirname(__file__), "..", "temp_data.json")
+    # Fetch initial tweet data
+    raw_tweets = []
+    for item in client.dataset(actor_run["defaultDatasetId"]).iterate_items():
+        if 'id' in item and item['id']:
+            tweet_username = item.get('user', {}).get('screen_name', username)
+            item['tweet_url'] = f"https://x.com/{tweet_username}/status/{item['id']}"
+        # Add URL_GROUP to each tweet
+        item['URL_GROUP'] = URL_GROUP
+        raw_tweets.append(item)
 
-# Load existing temp data if it exists
-existing_data = []
-if os.path.exists(temp_data_file):
-    try:
-        with open(temp_data_file, "r", encoding="utf-8") as f:
-            existing_data = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        existing_data = []
+    print(f"Retrieved {len(raw_tweets)} initial tweets")
 
-# Add URL_GROUP to each processed item and append to existing data
-for item in processed_data:
-    item['URL_GROUP'] = URL_GROUP
-    existing_data.append(item)
+    # Classify and process tweets (detect threads vs single tweets)
+    processed_data = classify_and_process_tweets(raw_tweets, deadline)
 
-# Save all data back to temp_data.json
-with open(temp_data_file, "w", encoding="utf-8") as f:
-    json.dump(existing_data, f, indent=2, ensure_ascii=False)
+    # Add URL_GROUP to each processed item
+    for item in processed_data:
+        item['URL_GROUP'] = URL_GROUP
 
-# Summary
-tweets_count = sum(1 for item in processed_data if item['content_type'] == 'tweet')
-threads_count = sum(1 for item in processed_data if item['content_type'] == 'thread')
-total_thread_tweets = sum(item['thread_length'] for item in processed_data if item['content_type'] == 'thread')
+    # Summary
+    tweets_count = sum(1 for item in processed_data if item['content_type'] == 'tweet')
+    threads_count = sum(1 for item in processed_data if item['content_type'] == 'thread')
+    total_thread_tweets = sum(item['thread_length'] for item in processed_data if item['content_type'] == 'thread')
 
-print(f"\nEnhanced Twitter scraping completed!")
-print(f"Data appended to: {temp_data_file}")
-print(f"Summary:")
-print(f"   - {tweets_count} single tweets")
-print(f"   - {threads_count} threads ({total_thread_tweets} total thread tweets)")
-print(f"   - {len(processed_data)} total content items")
+    print(f"\nEnhanced Twitter scraping completed!")
+    print(f"Summary:")
+    print(f"   - {tweets_count} single tweets")
+    print(f"   - {threads_count} threads ({total_thread_tweets} total thread tweets)")
+    print(f"   - {len(processed_data)} total content items")
 
+    return processed_data
 
 def extract_thread_ids_from_text(text, main_tweet_id):
     """Extract thread tweet IDs from tweet text that might contain thread links"""
@@ -347,21 +507,11 @@ def extract_thread_ids_from_text(text, main_tweet_id):
     
     # Look for common thread indicators in the text
     # Patterns like "1/", "1.", "Part 1", etc.
-    thread_indicators = [
-        r'\b1[/.]\s*\d+\s*part',
-        r'\bpart\s*1\b',
-        r'\b\d+\s*/\s*\d+',
-        r'\b\d+\s*of\s*\d+',
-        r'\bthread\b',
-        r'\b🧵\b'
-    ]
-    
-    for pattern in thread_indicators:
-        if re.search(pattern, text, re.IGNORECASE):
-            # If we find thread indicators, we should try to get more tweets
-            # For now, we'll just return with the main tweet ID
-            # In a more advanced implementation, we could try to resolve the t.co link
-            break
+    if _THREAD_INDICATOR_RE.search(text):
+        # If we find thread indicators, we should try to get more tweets
+        # For now, we'll just return with the main tweet ID
+        # In a more advanced implementation, we could try to resolve the t.co link
+        pass
     
     return thread_ids if thread_ids else [main_tweet_id] if main_tweet_id else []
 
@@ -404,3 +554,10 @@ def get_conversation_tweets(tweet_id, client):
     except Exception as e:
         print(f"Error getting conversation tweets for {tweet_id}: {e}")
         return [tweet_id]  # Return just the original tweet ID as fallback
+
+
+if __name__ == "__main__":
+    processed_data = run(sys.argv[1] if len(sys.argv) > 1 else twitter_url)
+
+    temp_data_file = append_temp_data(processed_data)
+    print(f"Data appended to: {temp_data_file}")